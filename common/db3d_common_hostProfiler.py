@@ -0,0 +1,341 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Houdini 19.0.622 Python 3 / Maya 2022.4
+####Script: common_hostProfiler
+####Version: 1.0
+####Note: Opt in host call profiler for the db3d tools. Wraps hou, maya.cmds and mtoa.aovs in a proxy that counts
+####      and times every call, including methods on returned nodes and objects made from host classes, and groups
+####      them per operation (the db3d function making the call, or the label of an enclosing operation() block)
+####      with the hottest call sites.
+####Usage: Put this folder on PYTHONPATH, set DB3D_PROFILE=1 and call install_from_env() from 123.py/userSetup.py.
+####       Run a tool, then hostProfiler.print_report(). DB3D_PROFILE_REPORT=path also writes the report as JSON on exit.
+
+import atexit
+import collections
+import contextlib
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+import types
+
+HOST_MODULES = ('hou','maya.cmds','mtoa.aovs')
+PRIMITIVES = (str,bytes,int,float,bool,type(None))
+THIS_MODULE = os.path.splitext(os.path.basename(__file__))[0]
+
+_state = threading.local()
+_installed = {}
+_stats = {}
+_lock = threading.Lock()
+_atexit = False
+
+##Stats
+class Call_Stats(object):
+    __slots__ = ('count','seconds')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def add(self,seconds):
+        self.count += 1
+        self.seconds += seconds
+
+class Operation_Stats(object):
+    def __init__(self):
+        self.calls = Call_Stats()
+        self.functions = collections.defaultdict(Call_Stats)
+        self.sites = collections.defaultdict(Call_Stats)
+
+def frame_name(frame):
+    code = frame.f_code
+    owner = frame.f_locals.get('self')
+    name = code.co_name if owner is None else type(owner).__name__+'.'+code.co_name
+    return os.path.splitext(os.path.basename(code.co_filename))[0]+':'+name
+
+def call_site():
+    #The first db3d frame outside this file is the call site and, unless a label is set, the operation
+    #Only walks up to that frame, every host call goes through here
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.basename(frame.f_code.co_filename)
+        if filename.startswith('db3d_') and not filename.startswith(THIS_MODULE):
+            break
+        frame = frame.f_back
+    labels = getattr(_state,'operations',None)
+    operation = labels[-1] if labels else None
+    if frame is None:
+        return operation or '<interactive>','<interactive>'
+    site = '{} line {}'.format(frame_name(frame),frame.f_lineno)
+    if operation is None:
+        #Comprehensions and lambdas count towards the function they run in
+        code = frame.f_code
+        while code.co_name.startswith('<') and code.co_name != '<module>':
+            parent = frame.f_back
+            if parent is None or parent.f_code.co_filename != code.co_filename:
+                break
+            frame = parent
+            code = frame.f_code
+        if code.co_name != '<module>':
+            operation = frame_name(frame)
+    return operation or '<interactive>',site
+
+def record(function,seconds):
+    operation,site = call_site()
+    with _lock:
+        stats = _stats.get(operation)
+        if stats is None:
+            stats = _stats[operation] = Operation_Stats()
+        stats.calls.add(seconds)
+        stats.functions[function].add(seconds)
+        stats.sites[site].add(seconds)
+
+@contextlib.contextmanager
+def operation(label):
+    #Groups the host calls inside under label instead of the db3d function making each call
+    labels = getattr(_state,'operations',None)
+    if labels is None:
+        labels = _state.operations = []
+    labels.append(label)
+    try:
+        yield
+    finally:
+        labels.pop()
+
+##Proxy
+def wrap_class(value,name):
+    #Exceptions stay real classes so except clauses still match them
+    if issubclass(value,BaseException):
+        return value
+    return Class_Proxy(value,name)
+
+def wrap(value,name):
+    if isinstance(value,PRIMITIVES) or isinstance(value,type) or isinstance(value,Host_Proxy):
+        return value
+    if isinstance(value,(list,tuple)):
+        if not any(not isinstance(item,PRIMITIVES) for item in value):
+            return value
+        return type(value)(wrap(item,name) for item in value)
+    if isinstance(value,dict):
+        return value
+    return Host_Proxy(value,name)
+
+def unwrap(value):
+    if isinstance(value,Host_Proxy):
+        return object.__getattribute__(value,'_target')
+    if isinstance(value,(list,tuple)):
+        return type(value)(unwrap(item) for item in value)
+    if isinstance(value,dict):
+        return dict((key,unwrap(item)) for key,item in value.items())
+    return value
+
+def timed(function,name):
+    def call(*args,**kwargs):
+        args = unwrap(args)
+        kwargs = unwrap(kwargs)
+        start = time.perf_counter()
+        try:
+            result = function(*args,**kwargs)
+        finally:
+            record(name,time.perf_counter()-start)
+        return wrap(result,name)
+    call.__name__ = getattr(function,'__name__',name)
+    call.__doc__ = getattr(function,'__doc__',None)
+    return call
+
+class Host_Proxy(object):
+    #Counts and times calls made through it, everything else is passed to the wrapped host object
+    __slots__ = ('_target','_name','__weakref__')
+
+    def __init__(self,target,name):
+        object.__setattr__(self,'_target',target)
+        object.__setattr__(self,'_name',name)
+
+    @property
+    def __class__(self):
+        #Keeps isinstance(node,hou.Node) working on wrapped nodes
+        return type(object.__getattribute__(self,'_target'))
+
+    def __getattr__(self,attr):
+        target = object.__getattribute__(self,'_target')
+        value = getattr(target,attr)
+        if isinstance(value,PRIMITIVES):
+            return value
+        if isinstance(target,(types.ModuleType,type)):
+            name = object.__getattribute__(self,'_name')+'.'+attr
+        else:
+            name = object.__getattribute__(self,'_name').split('.')[0]+'.'+type(target).__name__+'.'+attr
+        if isinstance(value,type):
+            #Host classes are wrapped so the objects they create, like AOVInterface(), are counted too
+            return wrap_class(value,name)
+        if callable(value):
+            return timed(value,name)
+        if isinstance(value,types.ModuleType) or isinstance(target,types.ModuleType):
+            #Submodules and module level objects like hou.ui and hou.undos
+            return Host_Proxy(value,name)
+        return value
+
+    def __setattr__(self,attr,value):
+        setattr(object.__getattribute__(self,'_target'),attr,unwrap(value))
+
+    def __dir__(self):
+        return dir(object.__getattribute__(self,'_target'))
+
+    def __call__(self,*args,**kwargs):
+        target = object.__getattribute__(self,'_target')
+        return timed(target,object.__getattribute__(self,'_name'))(*args,**kwargs)
+
+    def __enter__(self):
+        return wrap(object.__getattribute__(self,'_target').__enter__(),object.__getattribute__(self,'_name'))
+
+    def __exit__(self,*args):
+        return object.__getattribute__(self,'_target').__exit__(*args)
+
+    def __iter__(self):
+        name = object.__getattribute__(self,'_name')
+        return (wrap(item,name) for item in object.__getattribute__(self,'_target'))
+
+    def __len__(self):
+        return len(object.__getattribute__(self,'_target'))
+
+    def __getitem__(self,key):
+        return wrap(object.__getattribute__(self,'_target')[unwrap(key)],object.__getattribute__(self,'_name'))
+
+    def __contains__(self,item):
+        return unwrap(item) in object.__getattribute__(self,'_target')
+
+    def __bool__(self):
+        return bool(object.__getattribute__(self,'_target'))
+
+    def __eq__(self,other):
+        return object.__getattribute__(self,'_target') == unwrap(other)
+
+    def __ne__(self,other):
+        return object.__getattribute__(self,'_target') != unwrap(other)
+
+    def __lt__(self,other):
+        return object.__getattribute__(self,'_target') < unwrap(other)
+
+    def __hash__(self):
+        return hash(object.__getattribute__(self,'_target'))
+
+    def __repr__(self):
+        return repr(object.__getattribute__(self,'_target'))
+
+    def __str__(self):
+        return str(object.__getattribute__(self,'_target'))
+
+class Class_Proxy(Host_Proxy):
+    #Host class, calling it is timed and returns a wrapped instance. isinstance and subclassing see the real class
+    __slots__ = ()
+
+    def __instancecheck__(self,instance):
+        return isinstance(instance,object.__getattribute__(self,'_target'))
+
+    def __subclasscheck__(self,subclass):
+        return issubclass(unwrap(subclass),object.__getattribute__(self,'_target'))
+
+    def __mro_entries__(self,bases):
+        return (object.__getattribute__(self,'_target'),)
+
+##Install
+def enabled():
+    return os.environ.get('DB3D_PROFILE','') not in ('','0')
+
+def patch_loaded(original,proxy):
+    #Tools imported before install hold the real module, point them at the proxy too
+    for moduleName,module in list(sys.modules.items()):
+        if not moduleName.startswith('db3d_') or module is None or moduleName == __name__:
+            continue
+        for attr,value in list(vars(module).items()):
+            if value is original:
+                setattr(module,attr,proxy)
+
+def install(modules=HOST_MODULES):
+    global _atexit
+    for moduleName in modules:
+        if moduleName in _installed:
+            continue
+        try:
+            module = importlib.import_module(moduleName)
+        except ImportError:
+            continue
+        proxy = Host_Proxy(module,moduleName)
+        _installed[moduleName] = module
+        sys.modules[moduleName] = proxy
+        parent,_,child = moduleName.rpartition('.')
+        if parent:
+            setattr(sys.modules[parent],child,proxy)
+        patch_loaded(module,proxy)
+    if not _atexit:
+        atexit.register(report_on_exit)
+        _atexit = True
+    return list(_installed)
+
+def uninstall():
+    for moduleName,module in list(_installed.items()):
+        proxy = sys.modules.get(moduleName)
+        sys.modules[moduleName] = module
+        parent,_,child = moduleName.rpartition('.')
+        if parent:
+            setattr(sys.modules[parent],child,module)
+        if proxy is not None:
+            patch_loaded(proxy,module)
+        del _installed[moduleName]
+
+def install_from_env():
+    if enabled():
+        return install()
+    return []
+
+def start_from_env():
+    #Used by the batch tools at the start of every file, installs when DB3D_PROFILE is set and clears the last stats
+    if not install_from_env():
+        return False
+    reset()
+    return True
+
+##Report
+def reset():
+    with _lock:
+        _stats.clear()
+
+def snapshot(top=10,clear=False):
+    with _lock:
+        report = {}
+        for operationName,stats in sorted(_stats.items(),key=lambda item: -item[1].calls.seconds):
+            report[operationName] = {
+                'calls':stats.calls.count,
+                'seconds':stats.calls.seconds,
+                'functions':[[name,call.count,call.seconds] for name,call in sorted(stats.functions.items(),key=lambda item: -item[1].seconds)[:top]],
+                'sites':[[name,call.count,call.seconds] for name,call in sorted(stats.sites.items(),key=lambda item: -item[1].seconds)[:top]]}
+        if clear:
+            _stats.clear()
+    return report
+
+def format_report(report):
+    lines = []
+    for operationName,stats in report.items():
+        lines.append('{}: {} host calls, {:.3f}s'.format(operationName,stats['calls'],stats['seconds']))
+        lines.append('    Calls')
+        for name,count,seconds in stats['functions']:
+            lines.append('        {:>8} {:>10.4f}s  {}'.format(count,seconds,name))
+        lines.append('    Call sites')
+        for name,count,seconds in stats['sites']:
+            lines.append('        {:>8} {:>10.4f}s  {}'.format(count,seconds,name))
+    return '\n'.join(lines) if lines else 'No host calls recorded.'
+
+def print_report(top=10,clear=False):
+    print(format_report(snapshot(top,clear)))
+
+def write_report(path,top=10):
+    with open(path,'w') as report_file:
+        json.dump(snapshot(top),report_file,indent=4)
+
+def report_on_exit():
+    path = os.environ.get('DB3D_PROFILE_REPORT')
+    if path and _stats:
+        write_report(path)
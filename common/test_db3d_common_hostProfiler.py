@@ -0,0 +1,208 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Python 3
+####Script: common_hostProfiler tests
+####Version: 1.0
+####Note: Runs the profiler against a stand-in hou module and a stand-in db3d tool, no Houdini or Maya needed.
+####Usage: python -m unittest discover common
+
+import os
+import sys
+import types
+import unittest
+
+sys.path.insert(0,os.path.dirname(os.path.abspath(__file__)))
+
+import db3d_common_hostProfiler as hostProfiler
+
+HOU_SOURCE = '''
+class Node(object):
+    def __init__(self,name):
+        self.node_name = name
+    def name(self):
+        return self.node_name
+    def children(self):
+        return (Node('a'),Node('b'))
+    def __eq__(self,other):
+        return isinstance(other,Node) and other.node_name == self.node_name
+    def __hash__(self):
+        return hash(self.node_name)
+
+class OperationInterrupted(Exception):
+    pass
+
+class InterruptableOperation(object):
+    def __init__(self,label,open_interrupt_dialog=False):
+        self.label = label
+    def __enter__(self):
+        return self
+    def __exit__(self,*args):
+        return False
+    def updateProgress(self,fraction):
+        pass
+
+class _Undo_Group(object):
+    def __enter__(self):
+        return self
+    def __exit__(self,*args):
+        return False
+
+class _Undos(object):
+    def group(self,label):
+        return _Undo_Group()
+
+undos = _Undos()
+
+def node(path):
+    return Node(path)
+
+def copyNodesTo(nodes,parent):
+    #The real hou rejects proxies, so the profiler has to pass the wrapped objects
+    if not all(type(each) is Node for each in nodes) or type(parent) is not Node:
+        raise TypeError('Expected hou.Node')
+    return tuple(Node(each.name()+'1') for each in nodes)
+'''
+
+TOOL_SOURCE = '''
+import hou
+
+def child_names():
+    return [node.name() for node in hou.node('/obj').children()]
+
+def copy_children():
+    root = hou.node('/obj')
+    with hou.undos.group('Copy'):
+        copies = hou.copyNodesTo(root.children(),root)
+    return [copy.name() for copy in copies]
+
+def rename_all():
+    return child_names()
+
+def interruptable():
+    with hou.InterruptableOperation('Rename',open_interrupt_dialog=True) as operation:
+        operation.updateProgress(0.5)
+    return isinstance(operation,hou.InterruptableOperation)
+'''
+
+AOVS_SOURCE = '''
+class AOVInterface(object):
+    def __init__(self):
+        self.names = []
+    def addAOV(self,name,aovType='rgb'):
+        self.names.append(name)
+    def removeAOVs(self,names):
+        self.names = [name for name in self.names if name not in names]
+'''
+
+AOV_TOOL_SOURCE = '''
+import mtoa.aovs as aovs
+
+def add_aovs(names):
+    interface = aovs.AOVInterface()
+    for name in names:
+        interface.addAOV(name,aovType='rgb')
+    interface.removeAOVs(names[:1])
+    return interface.names
+'''
+
+def source_module(name,source):
+    module = types.ModuleType(name)
+    exec(compile(source,name+'.py','exec'),module.__dict__)
+    sys.modules[name] = module
+    return module
+
+class Host_Profiler_Test(unittest.TestCase):
+    def setUp(self):
+        self.saved = dict((name,sys.modules.get(name)) for name in ('hou','mtoa','mtoa.aovs','db3d_test_tool','db3d_test_aovs'))
+        self.hou = source_module('hou',HOU_SOURCE)
+        mtoa = source_module('mtoa','')
+        mtoa.aovs = source_module('mtoa.aovs',AOVS_SOURCE)
+        #Imported before install like a tool loaded from a shelf, install has to patch its hou
+        self.tool = source_module('db3d_test_tool',TOOL_SOURCE)
+        hostProfiler.install(('hou','mtoa.aovs'))
+        hostProfiler.reset()
+        self.aov_tool = source_module('db3d_test_aovs',AOV_TOOL_SOURCE)
+
+    def tearDown(self):
+        hostProfiler.uninstall()
+        hostProfiler.reset()
+        for name,module in self.saved.items():
+            if module is None:
+                sys.modules.pop(name,None)
+            else:
+                sys.modules[name] = module
+
+    def test_install_patches_loaded_tools(self):
+        self.assertIsInstance(self.tool.hou,hostProfiler.Host_Proxy)
+        hostProfiler.uninstall()
+        self.assertIs(self.tool.hou,self.hou)
+        self.assertIs(sys.modules['hou'],self.hou)
+
+    def test_counts_calls_per_operation(self):
+        self.assertEqual(self.tool.child_names(),['a','b'])
+        report = hostProfiler.snapshot()
+        stats = report['db3d_test_tool:child_names']
+        self.assertEqual(stats['calls'],4)
+        functions = dict((name,count) for name,count,seconds in stats['functions'])
+        self.assertEqual(functions,{'hou.node':1,'hou.Node.children':1,'hou.Node.name':2})
+
+    def test_stops_at_first_tool_frame(self):
+        self.tool.rename_all()
+        report = hostProfiler.snapshot()
+        self.assertEqual(list(report),['db3d_test_tool:child_names'])
+        sites = [name for name,count,seconds in report['db3d_test_tool:child_names']['sites']]
+        self.assertFalse([site for site in sites if 'rename_all' in site])
+
+    def test_operation_label(self):
+        with hostProfiler.operation('Batch'):
+            self.tool.rename_all()
+        self.assertEqual(list(hostProfiler.snapshot()),['Batch'])
+
+    def test_wrapped_nodes_behave_like_nodes(self):
+        self.assertEqual(self.tool.copy_children(),['a1','b1'])
+        node = self.tool.hou.node('a')
+        self.assertIsInstance(node,self.hou.Node)
+        self.assertEqual(node,self.hou.Node('a'))
+        self.assertIn(self.hou.Node('a'),{node})
+        with self.assertRaises(self.hou.OperationInterrupted):
+            raise self.tool.hou.OperationInterrupted()
+
+    def test_counts_objects_made_from_host_classes(self):
+        self.assertEqual(self.aov_tool.add_aovs(['a','b']),['b'])
+        stats = hostProfiler.snapshot()['db3d_test_aovs:add_aovs']
+        functions = dict((name,count) for name,count,seconds in stats['functions'])
+        self.assertEqual(functions,{'mtoa.aovs.AOVInterface':1,'mtoa.AOVInterface.addAOV':2,'mtoa.AOVInterface.removeAOVs':1})
+
+    def test_wrapped_classes_behave_like_classes(self):
+        self.assertTrue(self.tool.interruptable())
+        functions = [name for name,count,seconds in hostProfiler.snapshot()['db3d_test_tool:interruptable']['functions']]
+        self.assertEqual(sorted(functions),['hou.InterruptableOperation','hou.InterruptableOperation.updateProgress'])
+        node = self.hou.Node('a')
+        self.assertIsInstance(node,self.tool.hou.Node)
+        self.assertTrue(issubclass(self.hou.Node,self.tool.hou.Node))
+        class Child_Node(self.tool.hou.Node):
+            pass
+        self.assertTrue(issubclass(Child_Node,self.hou.Node))
+        self.assertIs(self.tool.hou.OperationInterrupted,self.hou.OperationInterrupted)
+
+    def test_start_from_env(self):
+        hostProfiler.uninstall()
+        environ = os.environ.pop('DB3D_PROFILE',None)
+        try:
+            self.assertFalse(hostProfiler.start_from_env())
+            self.assertIs(sys.modules['hou'],self.hou)
+            os.environ['DB3D_PROFILE'] = '1'
+            self.assertTrue(hostProfiler.start_from_env())
+            self.assertIsInstance(sys.modules['hou'],hostProfiler.Host_Proxy)
+        finally:
+            os.environ.pop('DB3D_PROFILE',None)
+            if environ is not None:
+                os.environ['DB3D_PROFILE'] = environ
+
+    def test_calls_outside_tools_are_interactive(self):
+        sys.modules['hou'].node('/obj').children()
+        self.assertEqual(list(hostProfiler.snapshot()),['<interactive>'])
+
+if __name__ =="__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Houdini 19.0.622 Python 3
+####Version: 1.0
+####Note: Chunked, cancellable execution for long db3d Houdini operations.
+####      Shows a progress bar with an ETA and rolls the whole undo group back when cancelled or when an item fails.
+
+import collections
+import time
+import traceback
+
+import hou
+
+Batch_Result = collections.namedtuple('Batch_Result',['done','total','interrupted','chunk_times','error'])
+
+def run_chunked(label,prepare,work,chunk_size=50):
+    #prepare() runs first and returns the items, work(item) is called for each one.
+    #Both run inside one undo group that is undone again if the artist cancels or anything raises,
+    #a half applied batch (like a rename cycle stuck on temp names) is never left in the scene.
+    start = time.time()
+    chunk_times = []
+    done = 0
+    total = 0
+    interrupted = False
+    error = None
+    details = None
+    with hou.undos.group(label):
+        try:
+            with hou.InterruptableOperation(label,long_operation_name=label,open_interrupt_dialog=True) as operation:
+                items = list(prepare())
+                total = len(items)
+                for chunk_start in range(0,total,chunk_size):
+                    chunk_time = time.time()
+                    for item in items[chunk_start:chunk_start+chunk_size]:
+                        work(item)
+                    done = min(total,chunk_start+chunk_size)
+                    chunk_times.append(time.time()-chunk_time)
+
+                    elapsed = time.time()-start
+                    eta = elapsed/done*(total-done)
+                    operation.updateLongProgress(float(done)/total,'{} of {}, about {:.0f}s left'.format(done,total,eta))
+        except hou.OperationInterrupted:
+            interrupted = True
+        except Exception as exception:
+            error = '{}: {}'.format(type(exception).__name__,exception)
+            details = traceback.format_exc()
+    if interrupted or error:
+        hou.undos.performUndo()
+
+    result = Batch_Result(done,total,interrupted,chunk_times,error)
+    message = result_message(label,result,time.time()-start)
+    print(message)
+    if error:
+        print(details)
+        hou.ui.setStatusMessage(message,severity=hou.severityType.Error)
+        hou.ui.displayMessage(message,severity=hou.severityType.Error,details=details)
+    else:
+        hou.ui.setStatusMessage(message)
+    return result
+
+def result_message(label,result,seconds):
+    if result.error:
+        return '{} failed after {} of {} ({}), changes were undone.'.format(label,result.done,result.total,result.error)
+    if result.interrupted:
+        return '{} cancelled after {} of {}, changes were undone.'.format(label,result.done,result.total)
+    slowest = max(result.chunk_times) if result.chunk_times else 0.0
+    return '{} finished {} items in {:.2f}s ({} chunks, slowest {:.3f}s).'.format(label,result.total,seconds,len(result.chunk_times),slowest)
@@ -0,0 +1,143 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Houdini 19.0.622 Python 3
+####Version: 1.0
+####Note: Headless Copy Renamer. Applies a JSON rename rule set to networks in many .hip files.
+####Usage: hython db3d_hou_batchRenamer.py --rules rules.json --network /obj shot_a.hip shot_b.hip
+
+import argparse
+import concurrent.futures
+import json
+import sys
+
+import db3d_hou_renamePlanner as planner
+
+
+#Networks
+def network_list(hou,paths,recursive=False):
+    networks = []
+    for path in paths:
+        network = hou.node(path)
+        if network is None:
+            continue
+        networks.append(network)
+        if recursive:
+            for node in network.allSubChildren():
+                #Contents of locked assets can't be renamed, setName would fail the whole file
+                if node.isInsideLockedHDA() or node.isLockedHDA():
+                    continue
+                if node.children():
+                    networks.append(node)
+    return networks
+
+def rename_network(network,pipeline,trim=False,dry_run=False):
+    children = list(network.children())
+    names = [node.name() for node in children]
+    #Sort by name like Copy_Renamer so numbering rules give the same result
+    order = sorted(range(len(names)),key=lambda i: names[i])
+    children = [children[i] for i in order]
+    names = [names[i] for i in order]
+
+    plan = planner.plan_renames(names,pipeline,trim)
+    resolution = planner.resolve_renames(names,plan.new_names,names)
+    renames = [[names[i],resolution.final_names[i]] for i in range(len(names)) if names[i] != resolution.final_names[i]]
+    if not dry_run:
+        for row,name in resolution.steps:
+            children[row].setName(name)
+    return {'network':network.path(),
+            'renames':renames,
+            'collisions':[names[i] for i in resolution.collisions],
+            'invalid':[[names[i],plan.new_names[i]] for i in resolution.invalid]}
+
+
+#Profiling
+def start_profiler():
+    #DB3D_PROFILE=1 counts the hou calls of every file, see db3d_common_hostProfiler.start_from_env
+    try:
+        import db3d_common_hostProfiler as hostProfiler
+    except ImportError:
+        return None
+    return hostProfiler if hostProfiler.start_from_env() else None
+
+
+#Files
+def process_hip(hip_path,rule_set,network_paths,recursive=False,dry_run=False):
+    hostProfiler = start_profiler()
+    import hou
+
+    report = {'hip':hip_path,'networks':[],'saved':False,'error':None}
+    try:
+        hou.hipFile.load(hip_path,suppress_save_prompt=True,ignore_load_warnings=True)
+        pipeline,trim = planner.pipeline_from_dict(rule_set)
+        renamed = False
+        for network in network_list(hou,network_paths,recursive):
+            network_report = rename_network(network,pipeline,trim,dry_run)
+            report['networks'].append(network_report)
+            renamed = renamed or bool(network_report['renames'])
+        if renamed and not dry_run:
+            hou.hipFile.save()
+            report['saved'] = True
+    except Exception as error:
+        report['error'] = '{}: {}'.format(type(error).__name__,error)
+    if hostProfiler:
+        report['profile'] = hostProfiler.snapshot(clear=True)
+    return report
+
+def process_hips(hip_paths,rule_set,network_paths,recursive=False,dry_run=False,workers=1):
+    if workers <= 1 or len(hip_paths) <= 1:
+        return [process_hip(hip_path,rule_set,network_paths,recursive,dry_run) for hip_path in hip_paths]
+    #One scene per process, every worker loads its own hip file
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_hip,hip_path,rule_set,network_paths,recursive,dry_run) for hip_path in hip_paths]
+        return [future.result() for future in futures]
+
+
+#Report
+def print_report(reports,dry_run=False):
+    for report in reports:
+        print(report['hip'])
+        if report['error']:
+            print('    Error : '+report['error'])
+            continue
+        for network_report in report['networks']:
+            print('    '+network_report['network'])
+            for old_name,new_name in network_report['renames']:
+                print('        {} -> {}'.format(old_name,new_name))
+            for name in network_report['collisions']:
+                print('        Warning : {} collides and is renumbered'.format(name))
+            for old_name,new_name in network_report['invalid']:
+                print('        Warning : {} is not renamed, "{}" is not a valid node name'.format(old_name,new_name))
+        if dry_run:
+            print('    Dry run, nothing saved.')
+        elif report['saved']:
+            print('    Saved.')
+        if report.get('profile'):
+            import db3d_common_hostProfiler as hostProfiler
+            print(hostProfiler.format_report(report['profile']))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply a Copy Renamer rule set to networks in .hip files.')
+    parser.add_argument('hips',nargs='+',help='.hip files to rename in')
+    parser.add_argument('--rules',required=True,help='JSON rule set')
+    parser.add_argument('--network',action='append',dest='networks',help='network path to rename the children of, defaults to /obj')
+    parser.add_argument('--recursive',action='store_true',help='also rename inside every subnetwork')
+    parser.add_argument('--dry-run',action='store_true',help='report the renames without saving')
+    parser.add_argument('--workers',type=int,default=1,help='number of worker processes')
+    parser.add_argument('--report',help='write the report as JSON to this path')
+    args = parser.parse_args(argv)
+
+    rule_set = planner.load_rule_set(args.rules)
+    #Fail early on a bad rule set instead of once per file
+    planner.pipeline_from_dict(rule_set)
+    network_paths = args.networks or ['/obj']
+
+    reports = process_hips(args.hips,rule_set,network_paths,args.recursive,args.dry_run,args.workers)
+    print_report(reports,args.dry_run)
+    if args.report:
+        with open(args.report,'w') as report_file:
+            json.dump(reports,report_file,indent=4)
+    return 1 if any(report['error'] for report in reports) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,12 +6,137 @@
 ####Note: Connect multiple secondary node parameters to a single primary node.
 ####Update:  Added attribute type check for string attributes.
 
+import collections
+import fnmatch
+import re
+
 from PySide2 import QtCore
 from PySide2 import QtWidgets
 from PySide2 import QtGui
 
 import hou
 
+import db3d_hou_batchJob as batchJob
+
+#Expression function used to reference each parameter type
+PARM_EXPRESSIONS = {'Float':'ch','Int':'ch','Toggle':'ch','Menu':'ch','String':'chs'}
+
+MULTIPARM_FOLDERS = ('MultiparmBlock','ScrollingMultiparmBlock','TabbedMultiparmBlock')
+
+#parent is the name of the ramp or multiparm the parm is an instance of, or None
+Parm_Descriptor = collections.namedtuple('Parm_Descriptor',['name','type_name','function','folders','parent'])
+Multiparm_Descriptor = collections.namedtuple('Multiparm_Descriptor',['name','type_name','count','folders','parent'])
+
+def multiparm_count(parm,type_name):
+    #A ramp evaluates to a hou.Ramp, its instance count is the number of points
+    if type_name == 'Ramp':
+        return len(parm.eval().keys())
+    return parm.eval()
+
+def set_multiparm_count(parm,type_name,count):
+    if type_name != 'Ramp':
+        parm.set(count)
+        return
+    #Placeholder points, their positions and values are linked to the primary afterwards
+    value = (0.0,0.0,0.0) if parm.eval().isColor() else 0.0
+    keys = [float(i)/max(count-1,1) for i in range(count)]
+    parm.set(hou.Ramp((hou.rampBasis.Linear,)*count,keys,(value,)*count))
+
+def parent_name(parm):
+    parent = parm.parentMultiParm()
+    return parent.name() if parent is not None else None
+
+def parm_descriptors(node):
+    #Read every parm tuple template once so secondaries never go back to the primary node.
+    #Ramps and multiparm folders come back as counts to match before their instances are linked.
+    descriptors = []
+    multiparms = []
+    for parm_tuple in node.parmTuples():
+        template = parm_tuple.parmTemplate()
+        type_name = template.type().name()
+        if type_name == 'Ramp' or (type_name == 'Folder' and template.folderType().name() in MULTIPARM_FOLDERS):
+            folders = parm_tuple[0].containingFolders()
+            multiparms.append(Multiparm_Descriptor(parm_tuple.name(),type_name,multiparm_count(parm_tuple[0],type_name),folders,parent_name(parm_tuple[0])))
+            continue
+        function = PARM_EXPRESSIONS.get(type_name)
+        if function:
+            folders = parm_tuple[0].containingFolders()
+            parent = parent_name(parm_tuple[0])
+            for parm in parm_tuple:
+                descriptors.append(Parm_Descriptor(parm.name(),type_name,function,folders,parent))
+    return descriptors,multiparms
+
+class Parm_Filter():
+    #Include/exclude patterns matched against parm names and the labels of their folders.
+    #Glob patterns are translated to regex so both kinds are compiled once into a single pattern.
+    def __init__(self,include='',exclude='',regex=False):
+        self.include = self.compile(include,regex)
+        self.exclude = self.compile(exclude,regex)
+
+    def compile(self,text,regex):
+        #Commas are part of regex syntax like {1,3}, so regex patterns are only split on whitespace
+        patterns = [pattern for pattern in re.split(r'\s+' if regex else r'[\s,]+',text) if pattern]
+        if not patterns:
+            return None
+        if not regex:
+            patterns = [fnmatch.translate(pattern) for pattern in patterns]
+        return re.compile('|'.join('(?:{})'.format(pattern) for pattern in patterns))
+
+    def is_active(self):
+        return self.include is not None or self.exclude is not None
+
+    def match(self,descriptor):
+        keys = (descriptor.name,)+tuple(descriptor.folders)
+        if self.include is not None and not any(self.include.match(key) for key in keys):
+            return False
+        if self.exclude is not None and any(self.exclude.match(key) for key in keys):
+            return False
+        return True
+
+    def apply(self,descriptors):
+        if not self.is_active():
+            return list(descriptors)
+        return [descriptor for descriptor in descriptors if self.match(descriptor)]
+
+    def apply_multiparms(self,multiparms,descriptors):
+        #Keep the count parm of every kept instance, and of its outer multiparms, so the instances exist
+        if not self.is_active():
+            return list(multiparms)
+        parents = dict((multiparm.name,multiparm.parent) for multiparm in multiparms)
+        keep = set(multiparm.name for multiparm in multiparms if self.match(multiparm))
+        for parent in [descriptor.parent for descriptor in descriptors]+[parents[name] for name in keep]:
+            while parent is not None and parent not in keep:
+                keep.add(parent)
+                parent = parents.get(parent)
+        return [multiparm for multiparm in multiparms if multiparm.name in keep]
+
+def link_expression(descriptor,path):
+    return '{}("{}/{}")'.format(descriptor.function,path,descriptor.name)
+
+def parm_expression(parm):
+    #Returns (expression,language), or (None,None) when the parm has no expression
+    try:
+        return parm.expression(),parm.expressionLanguage()
+    except hou.OperationFailed:
+        return None,None
+
+def baked_value(parm,descriptor):
+    #Strings keep the referenced parm's raw value so $HIP, $F and other variables are not expanded
+    if descriptor.function == 'chs':
+        try:
+            return parm.getReferencedParm().unexpandedString()
+        except hou.OperationFailed:
+            #The referenced parm is animated or an expression itself
+            return parm.evalAsString()
+    return parm.eval()
+
+def type_signature(node,descriptors):
+    #Split the primary descriptors into the ones this node has and the names it is missing
+    names = set(parm.name() for parm in node.parms())
+    links = [descriptor for descriptor in descriptors if descriptor.name in names]
+    missing = [descriptor.name for descriptor in descriptors if descriptor.name not in names]
+    return links,missing
+
 class ConnectNodeParms(QtWidgets.QWidget):
     def __init__(self, parent=None):
         QtWidgets.QWidget.__init__(self, parent)
@@ -24,6 +149,12 @@ class ConnectNodeParms(QtWidgets.QWidget):
         
         self.ui.primary_button.pressed.connect(self.get_primary_node)
         self.ui.connect_button.pressed.connect(self.connect_nodes)
+        self.ui.unlink_button.pressed.connect(self.unlink_nodes)
+        self.ui.include_edit.textEdited.connect(self.update_filter_count)
+        self.ui.exclude_edit.textEdited.connect(self.update_filter_count)
+        self.ui.filter_regex_toggle.stateChanged.connect(self.update_filter_count)
+
+        self.primary_descriptors = None
 
     def select_error(self):
         hou.ui.displayMessage('Select one node to be the primary node.')
@@ -34,6 +165,38 @@ class ConnectNodeParms(QtWidgets.QWidget):
             return
         for node in hou.selectedNodes():
             self.ui.primary_button.setText(node.path())
+            self.primary_descriptors = parm_descriptors(node)
+        self.update_filter_count()
+
+    def update_filter_count(self,*args):
+        #Preview against the descriptors read when the primary was picked
+        if self.primary_descriptors is None:
+            self.ui.filter_count_label.setText('')
+            return
+        parm_filter = self.get_parm_filter()
+        if parm_filter is None:
+            self.ui.filter_count_label.setText('Invalid pattern.')
+            return
+        descriptors,multiparms = self.primary_descriptors
+        count = len(parm_filter.apply(descriptors))
+        self.ui.filter_count_label.setText('Linking {} of {} parameters.'.format(count,len(descriptors)))
+
+    def get_parm_filter(self):
+        try:
+            return Parm_Filter(self.ui.include_edit.text(),
+                               self.ui.exclude_edit.text(),
+                               self.ui.filter_regex_toggle.isChecked())
+        except re.error:
+            return None
+
+    def get_primary_descriptors(self,primary_node):
+        parm_filter = self.get_parm_filter()
+        if parm_filter is None:
+            hou.ui.displayMessage('The parameter filter is not a valid pattern.')
+            return None
+        descriptors,multiparms = parm_descriptors(primary_node)
+        descriptors = parm_filter.apply(descriptors)
+        return descriptors,parm_filter.apply_multiparms(multiparms,descriptors)
  
     def connect_nodes(self):
         if self.ui.primary_button.text() == 'Select Primary Node':
@@ -41,34 +204,165 @@ class ConnectNodeParms(QtWidgets.QWidget):
             return
         
         primary_node = hou.node(self.ui.primary_button.text())
-        primary_parms = primary_node.parms()          
+        primary_descriptors = self.get_primary_descriptors(primary_node)
+        if primary_descriptors is None:
+            return
+        descriptors,multiparms = primary_descriptors
+        absolute_path = self.ui.parm_path_toggle.isChecked()
+        if absolute_path:
+            primary_path = primary_node.path()
 
-        for node in hou.selectedNodes():
-            if node != primary_node:            
-                #Set path
-                if self.ui.parm_path_toggle.isChecked():
-                    path = primary_node.path()
-                else:
-                    path = node.relativePathTo(primary_node)
-                #Set parm expressions
-                for i in range(len(primary_parms)):
-                    if primary_parms[i].parmTemplate().type().name() in ["Float","Int","Toggle"]:
-                        node.parm(primary_parms[i].name()).setExpression('ch("'+path+'/'+primary_parms[i].name()+'")')
-                    if primary_parms[i].parmTemplate().type().name() == "String":
-                        node.parm(primary_parms[i].name()).setExpression('chs("'+path+'/'+primary_parms[i].name()+'")')
+        #Secondaries of the same type share one signature once their multiparm counts match
+        signatures = {}
+        report = []
+        only_changed = self.ui.only_changed_toggle.isChecked()
+        counts = {'linked':0,'unchanged':0}
+
+        def secondary_nodes():
+            return [node for node in hou.selectedNodes() if node != primary_node]
+
+        def link_node(node):
+            skipped = []
+            #Match ramp and multiparm counts so the instance parms exist
+            for multiparm in multiparms:
+                parm = node.parm(multiparm.name)
+                if parm is None:
+                    continue
+                if only_changed and multiparm_count(parm,multiparm.type_name) == multiparm.count:
+                    continue
+                try:
+                    set_multiparm_count(parm,multiparm.type_name,multiparm.count)
+                except hou.Error:
+                    skipped.append(multiparm.name)
+
+            #nameWithCategory keeps e.g. the SOP and OBJ null apart
+            type_name = node.type().nameWithCategory()
+            if type_name not in signatures:
+                signatures[type_name] = type_signature(node,descriptors)
+            links,missing = signatures[type_name]
+
+            #Set path
+            if absolute_path:
+                path = primary_path
+            else:
+                path = node.relativePathTo(primary_node)
+            #Set parm expressions
+            for descriptor in links:
+                parm = node.parm(descriptor.name)
+                if parm is None:
+                    skipped.append(descriptor.name)
+                    continue
+                expression = link_expression(descriptor,path)
+                #Rewriting an identical expression still dirties the node and recooks downstream
+                if only_changed and parm_expression(parm) == (expression,hou.exprLanguage.Hscript):
+                    counts['unchanged'] += 1
+                    continue
+                try:
+                    parm.setExpression(expression,hou.exprLanguage.Hscript)
+                    counts['linked'] += 1
+                except hou.Error:
+                    skipped.append(descriptor.name)
+            if missing or skipped:
+                report.append((node.path(),missing,skipped))
+
+        result = batchJob.run_chunked('Connect Node Parameters',secondary_nodes,link_node,chunk_size=10)
+        if result.interrupted or result.error:
+            return
+        hou.ui.setStatusMessage('Linked {} parameters, {} were already linked.'.format(counts['linked'],counts['unchanged']))
+        self.report_unlinked(report)
+
+    def unlink_nodes(self):
+        if self.ui.primary_button.text() == 'Select Primary Node':
+            self.select_error()
+            return
+
+        primary_node = hou.node(self.ui.primary_button.text())
+        primary_descriptors = self.get_primary_descriptors(primary_node)
+        if primary_descriptors is None:
+            return
+        descriptors,multiparms = primary_descriptors
+        primary_path = primary_node.path()
+
+        #Replace links to the primary with their current value, other expressions are left alone
+        signatures = {}
+        counts = {'baked':0}
+
+        def secondary_nodes():
+            return [node for node in hou.selectedNodes() if node != primary_node]
+
+        def unlink_node(node):
+            type_name = node.type().nameWithCategory()
+            if type_name not in signatures:
+                signatures[type_name] = type_signature(node,descriptors)
+            links,missing = signatures[type_name]
+            relative_path = node.relativePathTo(primary_node)
+            for descriptor in links:
+                parm = node.parm(descriptor.name)
+                if parm is None:
+                    continue
+                expression = parm_expression(parm)[0]
+                if expression is None:
+                    continue
+                if expression not in (link_expression(descriptor,primary_path),link_expression(descriptor,relative_path)):
+                    continue
+                value = baked_value(parm,descriptor)
+                parm.deleteAllKeyframes()
+                parm.set(value)
+                counts['baked'] += 1
+
+        result = batchJob.run_chunked('Unlink Node Parameters',secondary_nodes,unlink_node,chunk_size=10)
+        if result.interrupted or result.error:
+            return
+        hou.ui.setStatusMessage('Baked {} linked parameters.'.format(counts['baked']))
+
+    def report_unlinked(self,report):
+        if not report:
+            return
+        details = []
+        for path,missing,skipped in report:
+            details.append(path)
+            if missing:
+                details.append('    Missing : '+', '.join(missing))
+            if skipped:
+                details.append('    Skipped : '+', '.join(skipped))
+        hou.ui.displayMessage('{} nodes could not be fully linked.'.format(len(report)),details='\n'.join(details))
 
 class ConnectNodeParms_UI():    
     def setup_ui(self, widget):
 
         self.primary_button = QtWidgets.QPushButton('Select Primary Node')
         self.parm_path_toggle = QtWidgets.QCheckBox('Absolute Path')
+        #Parameter Filter
+        include_label = QtWidgets.QLabel('Include: ')
+        self.include_edit = QtWidgets.QLineEdit()
+        self.include_edit.setToolTip('Parameter names or folder labels, separated by spaces.')
+        exclude_label = QtWidgets.QLabel('Exclude: ')
+        self.exclude_edit = QtWidgets.QLineEdit()
+        self.exclude_edit.setToolTip('Parameter names or folder labels, separated by spaces.')
+        self.filter_regex_toggle = QtWidgets.QCheckBox('Regex')
+        self.filter_count_label = QtWidgets.QLabel('')
+
+        filter_layout = QtWidgets.QGridLayout()
+        filter_layout.addWidget(include_label,0,0)
+        filter_layout.addWidget(self.include_edit,0,1)
+        filter_layout.addWidget(exclude_label,1,0)
+        filter_layout.addWidget(self.exclude_edit,1,1)
+        filter_layout.addWidget(self.filter_regex_toggle,2,0)
+        filter_layout.addWidget(self.filter_count_label,2,1)
+
+        self.only_changed_toggle = QtWidgets.QCheckBox('Only Changed Links')
+        self.only_changed_toggle.setChecked(True)
         self.connect_button = QtWidgets.QPushButton('Connect Secondary Nodes')
+        self.unlink_button = QtWidgets.QPushButton('Unlink Secondary Nodes')
 
         #Main Layout
         main_layout = QtWidgets.QGridLayout()
         main_layout.addWidget(self.primary_button,1,0)
         main_layout.addWidget(self.parm_path_toggle,2,0)
-        main_layout.addWidget(self.connect_button,3,0)
+        main_layout.addLayout(filter_layout,3,0)
+        main_layout.addWidget(self.only_changed_toggle,4,0)
+        main_layout.addWidget(self.connect_button,5,0)
+        main_layout.addWidget(self.unlink_button,6,0)
 
         #Widget
         widget.setLayout(main_layout)
@@ -6,12 +6,25 @@
 ####Note: Tool for copying and renaming selected nodes.
 ####Update: Added auto selection callbacks and fixed copy issues.
 
+import bisect
+import contextlib
+import functools
+import os
+
 from PySide2 import QtCore
 from PySide2 import QtWidgets
 from PySide2 import QtGui
 
 import hou
 
+import db3d_hou_batchJob as batchJob
+import db3d_hou_renamePlanner as planner
+
+def shots_root():
+    root = hou.getenv('DB3D_SHOTS_ROOT')
+    if root:
+        return root
+    return os.path.join(hou.getenv('JOB',''),'shots')
 
 class Copy_Renamer(QtWidgets.QWidget): 
     def __init__(self, parent=None):
@@ -25,36 +38,74 @@ class Copy_Renamer(QtWidgets.QWidget):
         self.ui = Check_OTL_Defaults_UI()
         self.ui.setup_ui(self)
 
+        #node_list rows are [type name,name,path,parent path,session id], staged names live in the journal
         self.node_list = []
+        self.journal = planner.Rename_Journal()
+        self.node_index = {}
+        self.node_parent_path = None
+        self.sibling_names = None
+        self.select_node_list = []
+        self.sync_paused = False
+        self.node_names = []
+        self.base_names = []
+        self.rule_chain = []
+        self.operation_index = 0
+        self.operation_rules = [self.rule_search_replace,
+                                self.rule_insert_overwrite,
+                                self.rule_numbering,
+                                self.rule_case,
+                                self.rule_trim,
+                                self.rule_arnold_rop]
+
+        #Coalesce fast edits into a single preview update
+        self.preview_timer = QtCore.QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(150)
+        self.preview_timer.timeout.connect(self.update_preview)
 
         #Connect UI
         self.ui.operation_combo.activated.connect(self.update_operation_select)
         self.ui.rop_output_check.toggled.connect(self.update_rop_output_toggled)
         self.ui.rop_variant_check.toggled.connect(self.update_rop_variant_toggled)
         self.ui.rop_context_check.toggled.connect(self.update_rop_context_toggled)
-
-        self.ui.search_replace_count_spin.valueChanged.connect(self.op_search_replace_table)
-        self.ui.search_edit.textEdited.connect(self.op_search_replace_table)
-        self.ui.replace_edit.textEdited.connect(self.op_search_replace_table)
-
-        self.ui.insert_overwrite_combo.activated.connect(self.op_insert_overwrite_table)
-        self.ui.insert_overwrite_text_edit.textEdited.connect(self.op_insert_overwrite_table)
-        self.ui.insert_overwrite_position_spin.valueChanged.connect(self.op_insert_overwrite_table)
-        self.ui.insert_overwrite_position_combo.activated.connect(self.op_insert_overwrite_table)
-        self.ui.insert_overwrite_spacing_toggle.stateChanged.connect(self.op_insert_overwrite_table)
-
-        self.ui.numbering_enable_toggle.stateChanged.connect(self.op_numbering_table)
-        self.ui.numbering_padding_spin.valueChanged.connect(self.op_numbering_table)
-        self.ui.numbering_start_spin.valueChanged.connect(self.op_numbering_table)
-        self.ui.numbering_insert_overwrite_combo.activated.connect(self.op_numbering_table)
-        self.ui.numbering_position_spin.valueChanged.connect(self.op_numbering_table)
-        self.ui.numbering_position_combo.activated.connect(self.op_numbering_table)
-        self.ui.numbering_spacing_toggle.stateChanged.connect(self.op_numbering_table)
+        self.ui.rop_output_edit.textEdited.connect(self.update_schedule_preview)
+        self.ui.rop_variant_edit.textEdited.connect(self.update_schedule_preview)
+        self.ui.rop_context_seq_combo.activated.connect(self.update_rop_context_seq_select)
+        self.ui.rop_context_shot_combo.activated.connect(self.update_schedule_preview)
+
+        self.ui.search_replace_count_spin.valueChanged.connect(self.update_schedule_preview)
+        self.ui.search_edit.textEdited.connect(self.update_schedule_preview)
+        self.ui.replace_edit.textEdited.connect(self.update_schedule_preview)
+        self.ui.search_regex_toggle.stateChanged.connect(self.update_schedule_preview)
+
+        self.ui.insert_overwrite_combo.activated.connect(self.update_schedule_preview)
+        self.ui.insert_overwrite_text_edit.textEdited.connect(self.update_schedule_preview)
+        self.ui.insert_overwrite_position_spin.valueChanged.connect(self.update_schedule_preview)
+        self.ui.insert_overwrite_position_combo.activated.connect(self.update_schedule_preview)
+        self.ui.insert_overwrite_spacing_toggle.stateChanged.connect(self.update_schedule_preview)
+
+        self.ui.numbering_enable_toggle.stateChanged.connect(self.update_schedule_preview)
+        self.ui.numbering_padding_spin.valueChanged.connect(self.update_schedule_preview)
+        self.ui.numbering_start_spin.valueChanged.connect(self.update_schedule_preview)
+        self.ui.numbering_insert_overwrite_combo.activated.connect(self.update_schedule_preview)
+        self.ui.numbering_position_spin.valueChanged.connect(self.update_schedule_preview)
+        self.ui.numbering_position_combo.activated.connect(self.update_schedule_preview)
+        self.ui.numbering_spacing_toggle.stateChanged.connect(self.update_schedule_preview)
+
+        self.ui.case_combo.activated.connect(self.update_schedule_preview)
+        self.ui.trim_left_spin.valueChanged.connect(self.update_schedule_preview)
+        self.ui.trim_right_spin.valueChanged.connect(self.update_schedule_preview)
+
+        self.ui.rule_add_button.pressed.connect(self.update_add_rule)
+        self.ui.rule_remove_button.pressed.connect(self.update_remove_rule)
+        self.ui.rule_clear_button.pressed.connect(self.update_clear_rules)
 
         self.ui.node_name_undo_button.pressed.connect(self.update_undo_node_list)
+        self.ui.node_name_redo_button.pressed.connect(self.update_redo_node_list)
         self.ui.node_name_edit_button.pressed.connect(self.update_edit_node_list)
 
         self.ui.trim_number_toggle.stateChanged.connect(self.update_trim_toggle_select)
+        self.ui.copy_toggle.stateChanged.connect(self.update_schedule_preview)
 
         self.ui.rename_button.pressed.connect(self.util_rename_nodes)
 
@@ -65,8 +116,9 @@ class Copy_Renamer(QtWidgets.QWidget):
 
     def selectionCallback(self,selection):
         self.select_node_list = selection
-        self.node_list = []
-        self.update_refresh_node_select()
+        if self.sync_paused:
+            return
+        self.update_sync_node_select()
 
     #Update
     def update_ui(self):
@@ -74,232 +126,498 @@ class Copy_Renamer(QtWidgets.QWidget):
         self.ui.replace_edit.setText('')
         self.ui.insert_overwrite_text_edit.setText('')
         self.ui.numbering_enable_toggle.setChecked(0)
+        self.ui.case_combo.setCurrentIndex(0)
+        self.ui.trim_left_spin.setValue(0)
+        self.ui.trim_right_spin.setValue(0)
 
-    def update_refresh_node_list(self):
-        self.node_list= []
-        for node in self.select_node_list:
-            if '__netbox' in node.name():
+    def update_clear_node_list(self):
+        self.node_list = []
+        self.node_index = {}
+        self.node_parent_path = None
+        self.sibling_names = None
+        self.journal.clear()
+
+    def update_sync_node_list(self):
+        #Diff the selection by session id and only query the host for new nodes.
+        nodes = [node for node in self.select_node_list if isinstance(node,hou.Node)]
+        if not nodes:
+            self.update_clear_node_list()
+            return [],[]
+        parent_path = nodes[0].parent().path()
+        if parent_path != self.node_parent_path:
+            self.update_clear_node_list()
+            self.node_parent_path = parent_path
+
+        selected = {}
+        for node in nodes:
+            selected[node.sessionId()] = node
+        removed = [sid for sid in self.node_index if sid not in selected]
+        added = []
+        for sid in removed:
+            del self.node_index[sid]
+            self.journal.remove(sid)
+        for sid,node in selected.items():
+            if sid in self.node_index:
                 continue
-            if '__stickynote' in node.name():
+            #Nodes outside the network are indexed as None so they are only checked once
+            node_parent_path = node.parent().path()
+            if node_parent_path != parent_path:
+                self.node_index[sid] = None
                 continue
-            if node.parent().path() == self.select_node_list[0].parent().path():
-                add_list = [node.name(),node.path(),node.parent().path()]
-                self.node_list.append(add_list)
-        self.node_list.sort()
-            
+            add_list = [node.type().name(),node.name(),node.path(),node_parent_path,sid]
+            self.node_index[sid] = add_list
+            self.journal.add(sid,add_list[-4])
+            added.append(add_list)
+        return removed,added
+
+    def update_sync_node_select(self):
+        old_rows = {}
+        for row,node in enumerate(self.node_list):
+            old_rows[node[-1]] = row
+        removed,added = self.update_sync_node_list()
+        if not old_rows or not self.node_list or len(added) > len(old_rows):
+            self.update_sort_node_list()
+            self.update_refresh_node_name_table()
+            self.update_preview()
+            return
+        if not removed and not added:
+            return
+
+        remove_rows = sorted(old_rows[sid] for sid in removed if sid in old_rows)
+        self.node_list = [node for node in self.node_list if node[-1] in self.node_index]
+        self.ui.node_name_model.remove_rows(remove_rows)
+
+        trim = self.ui.trim_number_toggle.isChecked()
+        keys = [node[-4] for node in self.node_list]
+        for add_list in sorted(added,key=lambda node: node[-4]):
+            row = bisect.bisect(keys,add_list[-4])
+            keys.insert(row,add_list[-4])
+            self.node_list.insert(row,add_list)
+            self.ui.node_name_model.insert_row(row,add_list[-4],planner.trim_names([add_list[-4]],trim)[0])
+        self.update_cache_names()
+        self.update_preview()
+
+    def update_sort_node_list(self):
+        self.node_list = [node for node in self.node_index.values() if node is not None]
+        self.node_list.sort(key=lambda node: node[-4])
+
+    def update_cache_names(self):
+        self.node_names = self.util_node_names()
+        self.base_names = planner.trim_names(self.node_names,self.ui.trim_number_toggle.isChecked())
+
     def update_refresh_node_name_table(self):
-        for i in range(self.ui.node_name_table.rowCount()):
-            self.ui.node_name_table.removeRow(0)
-
-        for node in self.node_list:
-            self.ui.node_name_table.insertRow(self.ui.node_name_table.rowCount())
-            item = QtWidgets.QTableWidgetItem(node[-3])
-            item.setFlags(QtCore.Qt.ItemIsEnabled)
-            self.ui.node_name_table.setItem(self.ui.node_name_table.rowCount()-1,0,item)
-            self.ui.node_name_table.item(self.ui.node_name_table.rowCount()-1,0).setBackground(QtGui.QColor(100,100,100))
-
-            name = self.util_trim_name_numbering(node[0])
-            item = QtWidgets.QTableWidgetItem(name)
-            item.setFlags(QtCore.Qt.ItemIsEnabled)
-            self.ui.node_name_table.setItem(self.ui.node_name_table.rowCount()-1,1,item)
-            self.ui.node_name_table.item(self.ui.node_name_table.rowCount()-1,1).setBackground(QtGui.QColor(100,100,100))
+        self.update_cache_names()
+        names = [node[-4] for node in self.node_list]
+        self.ui.node_name_model.set_rows(names,self.base_names)
 
     def update_refresh_node_select(self):
         self.update_ui()
-        self.update_refresh_node_list()
+        self.update_clear_node_list()
+        self.update_sync_node_list()
+        self.update_sort_node_list()
         self.update_refresh_node_name_table()
 
     def update_trim_toggle_select(self):
         self.update_refresh_node_name_table()
+        self.update_preview()
 
-        index = self.ui.operation_combo.currentIndex()
-        if index == 0:
-            self.op_search_replace_table()
-        if index == 1:
-            self.op_insert_overwrite_table()
-        if index == 2:
-            self.op_numbering_table()
+    def update_schedule_preview(self,*args):
+        self.preview_timer.start()
+
+    def update_preview(self):
+        self.preview_timer.stop()
+        self.op_preview_table()
+
+    def update_add_rule(self):
+        rule = self.rule_current()
+        if rule is None or not rule.is_active():
+            return
+        self.rule_chain.append(rule)
+        self.ui.rule_list.addItem(rule.label())
+        self.update_ui()
+        self.update_preview()
+
+    def update_remove_rule(self):
+        row = self.ui.rule_list.currentRow()
+        if row < 0:
+            return
+        del self.rule_chain[row]
+        self.ui.rule_list.takeItem(row)
+        self.update_preview()
+
+    def update_clear_rules(self):
+        self.rule_chain = []
+        self.ui.rule_list.clear()
+        self.update_preview()
 
     def update_edit_node_list(self):
-        count = len(self.node_list)
-        for i in range(count):
-            node = self.node_list[i]
-            new_name = self.ui.node_name_table.item(i,1).text()
-            node.insert(0,new_name)
-            self.ui.node_name_table.item(i,1).setBackground(QtGui.QColor(100,100,100))
+        if self.preview_timer.isActive():
+            self.update_preview()
+        self.journal.stage(self.util_node_keys(),self.ui.node_name_model.new_names)
+        self.ui.node_name_model.set_states(Node_Name_Model.STATE_DEFAULT)
         self.ui.trim_number_toggle.setChecked(0)
+        self.rule_chain = []
+        self.ui.rule_list.clear()
+        self.update_cache_names()
         self.update_ui()
 
     def update_undo_node_list(self):
-        count = len(self.node_list)
-        for i in range(count):
-            node = self.node_list[i]
-            if len(node) > 3:
-                item = QtWidgets.QTableWidgetItem(node[1])
-                del node[0]
-            node_name = self.util_trim_name_numbering(node[0])
-            item = QtWidgets.QTableWidgetItem(node_name)
-            item.setFlags(QtCore.Qt.ItemIsEnabled)
-            self.ui.node_name_table.setItem(i,1,item)
-            self.ui.node_name_table.item(i,1).setBackground(QtGui.QColor(100,100,100))
+        self.journal.undo()
+        self.update_journal_names()
+
+    def update_redo_node_list(self):
+        self.journal.redo()
+        self.update_journal_names()
+
+    def update_journal_names(self):
+        self.update_cache_names()
+        self.ui.node_name_model.set_new_names(self.base_names)
         self.update_ui()
-        
+
     def update_operation_select(self,index):
-        self.ui.search_replace_widget.setVisible(0)
-        self.ui.insert_overwrite_widget.setVisible(0)
-        self.ui.numbering_widget.setVisible(0)
-        self.ui.arnold_rop_widget.setVisible(0)
-
-        if index == 0:
-            self.ui.search_replace_widget.setVisible(1)
-        if index == 1:
-            self.ui.insert_overwrite_widget.setVisible(1)
-        if index == 2:
-            self.ui.numbering_widget.setVisible(1)
-        if index == 3:
-            self.ui.arnold_rop_widget.setVisible(1)
+        for i,operation_widget in enumerate(self.ui.operation_widgets):
+            operation_widget.setVisible(i == index)
         self.update_ui()
-        self.update_refresh_node_name_table()   
+        #The ROP context and variant are kept between edits, only a new operation clears them
+        if index != self.operation_index:
+            self.operation_index = index
+            self.ui.rop_variant_check.setChecked(0)
+            self.ui.rop_context_check.setChecked(0)
+        self.update_refresh_node_name_table()
+        self.update_preview()
 
     def update_rop_output_toggled(self,state):
         self.ui.rop_output_edit.setEnabled(state)
+        self.update_schedule_preview()
     def update_rop_variant_toggled(self,state):
         self.ui.rop_variant_edit.setEnabled(state)
+        self.update_schedule_preview()
     def update_rop_context_toggled(self,state):
         self.ui.rop_context_seq_combo.setEnabled(state)
         self.ui.rop_context_shot_combo.setEnabled(state)
+        if state:
+            #Rescanned every time the context is turned on so new shots show up without a restart
+            self.update_rop_context_seqs(refresh=True)
+        self.update_schedule_preview()
+
+    def update_rop_context_seqs(self,refresh=False):
+        #Sequences and shots are cached by the planner per shots root
+        root = shots_root()
+        shots = planner.find_shots(root,refresh)
+        self.ui.rop_context_seq_combo.setProperty('shots_root',root)
+        if not shots:
+            return
+        seq = self.ui.rop_context_seq_combo.currentText()
+        self.ui.rop_context_seq_combo.clear()
+        self.ui.rop_context_seq_combo.addItems(list(shots))
+        if seq in shots:
+            self.ui.rop_context_seq_combo.setCurrentText(seq)
+        self.update_rop_context_seq_select()
+
+    def update_rop_context_seq_select(self,*args):
+        shots = planner.find_shots(self.ui.rop_context_seq_combo.property('shots_root'))
+        seq = self.ui.rop_context_seq_combo.currentText()
+        if seq in shots:
+            shot = self.ui.rop_context_shot_combo.currentText()
+            self.ui.rop_context_shot_combo.clear()
+            self.ui.rop_context_shot_combo.addItems(shots[seq])
+            if shot in shots[seq]:
+                self.ui.rop_context_shot_combo.setCurrentText(shot)
+        self.update_schedule_preview()
 
     #Utilities
     def util_rename_nodes(self):
+        rop_output = self.util_rop_output_template()
+        rop_tokens = self.util_rop_tokens()
         self.update_edit_node_list()
-        if self.ui.copy_toggle.isChecked():
-            copy_list = []
-            for node in self.node_list:
-                node = hou.node(node[-2])
-                copy_list.append(node)
-            tuple(copy_list)
-            copy_nodes = hou.copyNodesTo(copy_list,copy_list[0].parent())
-            for node in self.node_list:
+        if not self.node_list:
+            return
+        #Names setName refuses would stop the batch partway, nothing is renamed until they are fixed
+        invalid = [name for name in self.util_node_names() if not planner.valid_node_name(name)]
+        if invalid:
+            hou.ui.displayMessage('{} new names are not valid node names.'.format(len(invalid)),
+                                  severity=hou.severityType.Error,details='\n'.join(repr(name) for name in invalid))
+            return
+
+        def prepare():
+            #Copies and collision resolution happen up front, the renames run as chunked tasks
+            nodes = [hou.nodeBySessionId(node[-1]) for node in self.node_list]
+            new_names = self.util_node_names()
+            sibling_names = set(child.name() for child in nodes[0].parent().children())
+            if self.ui.copy_toggle.isChecked():
+                #copyNodesTo returns the copies in the same order as the nodes passed in
+                copy_nodes = hou.copyNodesTo(nodes,nodes[0].parent())
+                copy_names = [copy.name() for copy in copy_nodes]
+                sibling_names.update(copy_names)
                 for copy in copy_nodes:
-                    if node[-3].rstrip('0123456789_') in copy.name():
-                        copy.setName(node[0],unique_name=True)
-                    copy.move((1,-1))                       
-            self.update_refresh_node_select()
-        else:
-            for node in self.node_list:
-                node_path = hou.node(node[-2])
-                node_name = node[0]
-                node_path.setName(node_name,unique_name=True)
-            self.update_refresh_node_select()
-
-        for i in range(self.ui.node_name_table.rowCount()):
-            self.ui.node_name_table.item(i,1).setBackground(QtGui.QColor(100,150,100))
-
-    def util_trim_name_numbering(self,name):
-        if self.ui.trim_number_toggle.isChecked():
-            name = name.rstrip('0123456789_')
-        return name
-
-    def util_insert_text(self,i,name,text,position,ui_insert_overwrite,ui_position,ui_spacing):
-        if ui_spacing:
-            if position == 0 or position >= len(name):
-                if ui_position:
-                    if position >= len(name):
-                        text += '_'
-                    else:
-                        text = '_'+text
-                else:
-                    if position >= len(name):
-                        text = '_'+text
-                    else:
-                        text += '_'
-            else:
-                text = '_'+text+'_'
-        if ui_insert_overwrite:
-            if len(text) == len(name):
-                name = ''
-            else:
-                name = list(name)
-                if ui_position:
-                    if position == 0 or position >= len(name)-1:
-                        del name[(len(name)-len(text)):len(name)]
-                    else:
-                        del name[(len(name)-len(text)-position):(len(name)-position)]
-                else:
-                    if position >= len(name)-1:
-                        del name[(len(name)-len(text)):len(name)]
-                    else:
-                        del name[position:(len(text)+position)]
-                name = ''.join(name)
-        if ui_position:                      
-            if position == 0:
-                name += text
+                    copy.move((1,-1))
+                resolution = planner.resolve_renames(copy_names,new_names,sibling_names)
+                nodes = copy_nodes
             else:
-                name = name[:(position*-1)]+text+name[(position*-1):]
-        else:                        
-            name = name[:position]+text+name[position:]
-        item = QtWidgets.QTableWidgetItem(name)
-        item.setFlags(QtCore.Qt.ItemIsEnabled)
-        self.ui.node_name_table.setItem(i,1,item)
-        self.ui.node_name_table.item(i,1).setBackground(QtGui.QColor(150,100,100))
+                old_names = [node[-4] for node in self.node_list]
+                resolution = planner.resolve_renames(old_names,new_names,sibling_names)
+            tasks = [functools.partial(nodes[row].setName,name) for row,name in resolution.steps]
+            if rop_output is not None:
+                template = planner.compile_template(rop_output)
+                for node,name in zip(nodes,resolution.final_names):
+                    tasks.append(functools.partial(self.util_apply_rop_output,node,name,template,rop_tokens))
+            return tasks
+
+        with self.util_paused_selection_sync():
+            result = batchJob.run_chunked('Copy Renamer',prepare,lambda task: task())
+        self.update_refresh_node_select()
 
-    #Operations
-    def op_search_replace_table(self):
-        search = self.ui.search_edit.text()
-        replace = self.ui.replace_edit.text()
-        if search == "":
-            self.update_refresh_node_name_table() 
+        if not result.interrupted and not result.error:
+            self.ui.node_name_model.set_states(Node_Name_Model.STATE_RENAMED)
+
+    def util_apply_rop_output(self,node,name,template,tokens):
+        if node.type().name() != 'arnold':
             return
-        for i in range(len(self.node_list)):
-            node = self.node_list[i]
-            node_name = node[0]
-            if self.ui.search_replace_count_spin.value() == 0:
-                node_name_new = node_name.replace(search,replace)
-            else:
-                node_name_new = node_name.replace(search,replace,self.ui.search_replace_count_spin.value())
-            if search in node[0]:
-                if node_name != node_name_new:
-                    node_name_new = self.util_trim_name_numbering(node_name_new)
-                    item = QtWidgets.QTableWidgetItem(node_name_new)
-                    item.setFlags(QtCore.Qt.ItemIsEnabled)
-                    self.ui.node_name_table.setItem(i,1,item)
-                    self.ui.node_name_table.item(i,1).setBackground(QtGui.QColor(150,100,100))            
+        tokens = dict(tokens)
+        tokens['name'] = name
+        tokens['aov'] = 'beauty'
+        parms = {'ar_picture':template.render(tokens)}
+        if 'aov' in template.tokens:
+            #Give every separate AOV file its own path from the same template
+            aov_parm = node.parm('ar_aovs')
+            aov_count = aov_parm.eval() if aov_parm else 0
+            for i in range(1,aov_count+1):
+                tokens['aov'] = node.parm('ar_aov_label{}'.format(i)).eval()
+                parms['ar_aov_separate{}'.format(i)] = 1
+                parms['ar_aov_separate_file{}'.format(i)] = template.render(tokens)
+        node.setParms(parms)
+
+    def util_rop_output_template(self):
+        if self.ui.operation_combo.currentIndex() != self.ui.operation_widgets.index(self.ui.arnold_rop_widget):
+            return None
+        if not self.ui.rop_output_check.isChecked() or not self.ui.rop_output_edit.text():
+            return None
+        return self.ui.rop_output_edit.text()
+
+    def util_rop_row(self,row):
+        #Looked up on every preview, chained rules follow rows added and removed by the selection sync
+        return self.node_list[row][-5] == 'arnold'
+
+    def util_rop_tokens(self):
+        if self.ui.rop_context_check.isChecked():
+            seq = self.ui.rop_context_seq_combo.currentText()
+            shot = self.ui.rop_context_shot_combo.currentText()
+        else:
+            seq = hou.getenv('SEQ','')
+            shot = hou.getenv('SHOT','')
+        variant = self.ui.rop_variant_edit.text() if self.ui.rop_variant_check.isChecked() else ''
+        return {'seq':seq,'shot':shot,'variant':variant}
+
+    def util_sibling_names(self):
+        if self.sibling_names is None:
+            parent = hou.node(self.node_parent_path) if self.node_parent_path else None
+            if parent is None:
+                self.sibling_names = set()
             else:
-                node_name = self.util_trim_name_numbering(node_name)
-                item = QtWidgets.QTableWidgetItem(node_name)
-                item.setFlags(QtCore.Qt.ItemIsEnabled)
-                self.ui.node_name_table.setItem(i,1,item)
-                self.ui.node_name_table.item(i,1).setBackground(QtGui.QColor(100,100,100))
-
-    def op_insert_overwrite_table(self):
-        text = self.ui.insert_overwrite_text_edit.text()
-        if text == "":
-            self.update_refresh_node_name_table() 
+                self.sibling_names = set(child.name() for child in parent.children())
+        return self.sibling_names
+
+    def util_resolve_preview(self,new_names):
+        if self.ui.copy_toggle.isChecked():
+            #Copies do not exist yet, give them keys that can never match a node name
+            old_names = [(i,) for i in range(len(new_names))]
+        else:
+            old_names = [node[-4] for node in self.node_list]
+        return planner.resolve_renames(old_names,new_names,self.util_sibling_names())
+
+    @contextlib.contextmanager
+    def util_paused_selection_sync(self):
+        self.sync_paused = True
+        try:
+            yield
+        finally:
+            self.sync_paused = False
+
+    def util_node_names(self):
+        return self.journal.names(self.util_node_keys())
+
+    def util_node_keys(self):
+        return [node[-1] for node in self.node_list]
+
+    def util_plan_table(self,rule):
+        plan = planner.plan_renames(self.node_names,rule,self.ui.trim_number_toggle.isChecked(),self.base_names)
+        resolution = self.util_resolve_preview(plan.new_names)
+        self.ui.node_name_model.set_new_names(plan.new_names,plan.changed,resolution.collisions,resolution.invalid)
+        self.util_rop_output_preview(plan.new_names)
+        return plan
+
+    def util_rop_output_preview(self,new_names):
+        template = self.util_rop_output_template()
+        if template is None or not new_names:
+            self.ui.rop_output_preview_label.setText('')
             return
-        position = self.ui.insert_overwrite_position_spin.value()
-        ui_insert_overwrite = self.ui.insert_overwrite_combo.currentIndex()
-        ui_position = self.ui.insert_overwrite_position_combo.currentIndex()
-        ui_spacing = self.ui.insert_overwrite_spacing_toggle.isChecked()
-
-        for i in range(len(self.node_list)):
-            name = self.util_trim_name_numbering(self.node_list[i][0])
-            self.util_insert_text(i,name,text,position,ui_insert_overwrite,ui_position,ui_spacing)
-
-    def op_numbering_table(self):
-        padding = self.ui.numbering_padding_spin.value()
-        start = self.ui.numbering_start_spin.value()
-        position = self.ui.numbering_position_spin.value()
-        ui_insert_overwrite = self.ui.numbering_insert_overwrite_combo.currentIndex()
-        ui_position = self.ui.numbering_position_combo.currentIndex()
-        ui_spacing = self.ui.numbering_spacing_toggle.isChecked()
-
-        if self.ui.numbering_enable_toggle.isChecked():
-            for i in range(len(self.node_list)):
-                name = self.util_trim_name_numbering(self.node_list[i][0])
-                number = str(start+i).rjust(padding,str(0))
-                self.util_insert_text(i,name,number,position,ui_insert_overwrite,ui_position,ui_spacing)
+        tokens = self.util_rop_tokens()
+        tokens['name'] = new_names[0]
+        tokens['aov'] = 'beauty'
+        self.ui.rop_output_preview_label.setText(planner.compile_template(template).render(tokens))
+
+    #Rules
+    def rule_current(self):
+        index = self.ui.operation_combo.currentIndex()
+        if index < 0 or index >= len(self.operation_rules):
+            return None
+        return self.operation_rules[index]()
+
+    def rule_search_replace(self):
+        if self.ui.search_regex_toggle.isChecked():
+            return planner.Regex_Replace_Rule(self.ui.search_edit.text(),
+                                              self.ui.replace_edit.text(),
+                                              self.ui.search_replace_count_spin.value())
+        return planner.Search_Replace_Rule(self.ui.search_edit.text(),
+                                           self.ui.replace_edit.text(),
+                                           self.ui.search_replace_count_spin.value())
+
+    def rule_insert_overwrite(self):
+        return planner.Insert_Overwrite_Rule(self.ui.insert_overwrite_text_edit.text(),
+                                             self.ui.insert_overwrite_position_spin.value(),
+                                             self.ui.insert_overwrite_combo.currentIndex(),
+                                             self.ui.insert_overwrite_position_combo.currentIndex(),
+                                             self.ui.insert_overwrite_spacing_toggle.isChecked())
+
+    def rule_numbering(self):
+        return planner.Numbering_Rule(self.ui.numbering_start_spin.value(),
+                                      self.ui.numbering_padding_spin.value(),
+                                      self.ui.numbering_position_spin.value(),
+                                      self.ui.numbering_insert_overwrite_combo.currentIndex(),
+                                      self.ui.numbering_position_combo.currentIndex(),
+                                      self.ui.numbering_spacing_toggle.isChecked(),
+                                      self.ui.numbering_enable_toggle.isChecked())
+
+    def rule_arnold_rop(self):
+        #ROP names are [shot_]name[_variant]
+        template = ['{name}']
+        if self.ui.rop_context_check.isChecked():
+            template.insert(0,'{shot}')
+        if self.ui.rop_variant_check.isChecked() and self.ui.rop_variant_edit.text():
+            template.append('{variant}')
+        #Only Arnold ROP rows are renamed, other selected nodes keep their names
+        return planner.Template_Rule('_'.join(template),self.util_rop_tokens(),self.util_rop_row)
+
+    def rule_case(self):
+        return planner.Case_Rule(self.ui.case_combo.currentData())
+
+    def rule_trim(self):
+        return planner.Trim_Rule(self.ui.trim_left_spin.value(),
+                                 self.ui.trim_right_spin.value())
+
+    #Operations
+    def op_preview_table(self):
+        #Chained rules and the operation being edited run as one pipeline
+        rule = self.rule_current()
+        if rule is not None and rule.error:
+            hou.ui.setStatusMessage(rule.error,severity=hou.severityType.Warning)
+        self.util_plan_table(planner.Rule_Pipeline(self.rule_chain+[rule]))
+
+class Node_Name_Model(QtCore.QAbstractTableModel):
+    #Keeps the preview in plain lists, the view only asks for the visible rows.
+    STATE_DEFAULT = 0
+    STATE_CHANGED = 1
+    STATE_RENAMED = 2
+    STATE_COLLISION = 3
+    STATE_INVALID = 4
+
+    HEADERS = ['Node Name','New Node Name']
+
+    def __init__(self, parent=None):
+        QtCore.QAbstractTableModel.__init__(self, parent)
+        self.names = []
+        self.new_names = []
+        self.states = []
+        self.brushes = {self.STATE_DEFAULT:QtGui.QBrush(QtGui.QColor(100,100,100)),
+                        self.STATE_CHANGED:QtGui.QBrush(QtGui.QColor(150,100,100)),
+                        self.STATE_RENAMED:QtGui.QBrush(QtGui.QColor(100,150,100)),
+                        self.STATE_COLLISION:QtGui.QBrush(QtGui.QColor(160,130,60)),
+                        self.STATE_INVALID:QtGui.QBrush(QtGui.QColor(170,60,60))}
+
+    def rowCount(self,parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.names)
+
+    def columnCount(self,parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 2
+
+    def flags(self,index):
+        return QtCore.Qt.ItemIsEnabled
+
+    def headerData(self,section,orientation,role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self,index,role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == QtCore.Qt.DisplayRole:
+            if index.column() == 0:
+                return self.names[row]
+            return self.new_names[row]
+        if role == QtCore.Qt.BackgroundRole:
+            if index.column() == 0:
+                return self.brushes[self.STATE_DEFAULT]
+            return self.brushes[self.states[row]]
+        return None
+
+    def set_rows(self,names,new_names):
+        self.beginResetModel()
+        self.names = list(names)
+        self.new_names = list(new_names)
+        self.states = [self.STATE_DEFAULT]*len(self.names)
+        self.endResetModel()
+
+    def set_new_names(self,new_names,changed=None,collisions=None,invalid=None):
+        new_names = list(new_names)
+        if len(new_names) != len(self.names):
+            #Rows are added and removed with the node list, a different count means the two are out of sync
+            raise ValueError('Expected {} new names, got {}.'.format(len(self.names),len(new_names)))
+        if changed is None:
+            states = [self.STATE_DEFAULT]*len(new_names)
         else:
-            self.update_refresh_node_name_table()             
+            states = [self.STATE_CHANGED if state else self.STATE_DEFAULT for state in changed]
+        if collisions:
+            for row in collisions:
+                states[row] = self.STATE_COLLISION
+        if invalid:
+            for row in invalid:
+                states[row] = self.STATE_INVALID
+        #Only repaint the span of rows whose output actually changed
+        rows = [i for i,(old,new,old_state,new_state) in enumerate(zip(self.new_names,new_names,self.states,states)) if old != new or old_state != new_state]
+        self.new_names = new_names
+        self.states = states
+        self.emit_new_names_changed(rows)
+
+    def set_states(self,state):
+        rows = [i for i,old_state in enumerate(self.states) if old_state != state]
+        self.states = [state]*len(self.names)
+        self.emit_new_names_changed(rows)
+
+    def remove_rows(self,rows):
+        for row in reversed(rows):
+            self.beginRemoveRows(QtCore.QModelIndex(),row,row)
+            del self.names[row]
+            del self.new_names[row]
+            del self.states[row]
+            self.endRemoveRows()
+
+    def insert_row(self,row,name,new_name):
+        self.beginInsertRows(QtCore.QModelIndex(),row,row)
+        self.names.insert(row,name)
+        self.new_names.insert(row,new_name)
+        self.states.insert(row,self.STATE_DEFAULT)
+        self.endInsertRows()
+
+    def emit_new_names_changed(self,rows):
+        if not rows:
+            return
+        self.dataChanged.emit(self.index(rows[0],1),self.index(rows[-1],1))
 
 class Check_OTL_Defaults_UI():
     def search_replace_ui(self):
@@ -310,6 +628,8 @@ class Check_OTL_Defaults_UI():
         search_replace_count_layout = QtWidgets.QHBoxLayout()
         search_replace_count_layout.addWidget(search_replace_count_label)
         search_replace_count_layout.addWidget(self.search_replace_count_spin)
+        self.search_regex_toggle = QtWidgets.QCheckBox('Regex')
+        search_replace_count_layout.addWidget(self.search_regex_toggle)
 
         search_label = QtWidgets.QLabel('Search:   ')
         self.search_edit = QtWidgets.QLineEdit()
@@ -414,10 +734,66 @@ class Check_OTL_Defaults_UI():
         
         return self.numbering_widget        
 
+    def case_ui(self):
+        case_label = QtWidgets.QLabel('Case: ')
+        self.case_combo = QtWidgets.QComboBox()
+        for label,mode in [('Unchanged',''),('lower','lower'),('UPPER','upper'),('Title','title'),('Capitalize','capitalize')]:
+            self.case_combo.addItem(label,mode)
+
+        case_layout = QtWidgets.QHBoxLayout()
+        case_layout.addWidget(case_label)
+        case_layout.addWidget(self.case_combo)
+
+        self.case_widget = QtWidgets.QWidget()
+        self.case_widget.setMinimumWidth(350)
+        self.case_widget.setLayout(case_layout)
+
+        return self.case_widget
+
+    def trim_ui(self):
+        trim_left_label = QtWidgets.QLabel('Left: ')
+        trim_left_label.setAlignment(QtCore.Qt.AlignRight)
+        self.trim_left_spin = QtWidgets.QSpinBox()
+        trim_right_label = QtWidgets.QLabel('Right: ')
+        trim_right_label.setAlignment(QtCore.Qt.AlignRight)
+        self.trim_right_spin = QtWidgets.QSpinBox()
+
+        trim_layout = QtWidgets.QHBoxLayout()
+        trim_layout.addWidget(trim_left_label)
+        trim_layout.addWidget(self.trim_left_spin)
+        trim_layout.addWidget(trim_right_label)
+        trim_layout.addWidget(self.trim_right_spin)
+
+        self.trim_widget = QtWidgets.QWidget()
+        self.trim_widget.setMinimumWidth(350)
+        self.trim_widget.setLayout(trim_layout)
+
+        return self.trim_widget
+
+    def rule_chain_ui(self):
+        self.rule_list = QtWidgets.QListWidget()
+        self.rule_list.setMaximumHeight(80)
+        self.rule_add_button = QtWidgets.QPushButton('Add Rule')
+        self.rule_remove_button = QtWidgets.QPushButton('Remove Rule')
+        self.rule_clear_button = QtWidgets.QPushButton('Clear Rules')
+
+        rule_button_layout = QtWidgets.QHBoxLayout()
+        rule_button_layout.addWidget(self.rule_add_button)
+        rule_button_layout.addWidget(self.rule_remove_button)
+        rule_button_layout.addWidget(self.rule_clear_button)
+
+        rule_chain_layout = QtWidgets.QVBoxLayout()
+        rule_chain_layout.addWidget(self.rule_list)
+        rule_chain_layout.addLayout(rule_button_layout)
+
+        return rule_chain_layout
+
     def arnold_rop_ui(self):
         self.rop_output_check = QtWidgets.QCheckBox('Output: ')
-        self.rop_output_edit = QtWidgets.QLineEdit()
+        self.rop_output_edit = QtWidgets.QLineEdit('$JOB/render/{seq}/{shot}/{name}/{name}.$F4.exr')
+        self.rop_output_edit.setToolTip('Tokens: {seq} {shot} {name} {variant} {aov}')
         self.rop_output_edit.setEnabled(False)
+        self.rop_output_preview_label = QtWidgets.QLabel('')
 
         rop_output_layout = QtWidgets.QHBoxLayout()
         rop_output_layout.addWidget(self.rop_output_check)
@@ -446,6 +822,7 @@ class Check_OTL_Defaults_UI():
 
         arnold_rop_layout = QtWidgets.QVBoxLayout()
         arnold_rop_layout.addLayout(rop_output_layout)
+        arnold_rop_layout.addWidget(self.rop_output_preview_label)
         arnold_rop_layout.addLayout(rop_variant_layout)
         arnold_rop_layout.addLayout(rop_context_layout)
 
@@ -457,26 +834,40 @@ class Check_OTL_Defaults_UI():
 
     def setup_ui(self, widget):
         #Parameter Table
-        self.node_name_table = QtWidgets.QTableWidget(0,2)
-        self.node_name_table.setHorizontalHeaderLabels(['Node Name','New Node Name'])
+        self.node_name_model = Node_Name_Model()
+        self.node_name_table = QtWidgets.QTableView()
+        self.node_name_table.setModel(self.node_name_model)
         self.node_name_table.verticalHeader().setVisible(False)
+        self.node_name_table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.node_name_table.verticalHeader().setDefaultSectionSize(self.node_name_table.fontMetrics().height()+6)
         self.node_name_table.horizontalHeader().setSectionResizeMode(0,QtWidgets.QHeaderView.Stretch)
         self.node_name_table.horizontalHeader().setSectionResizeMode(1,QtWidgets.QHeaderView.Stretch)
 
         #Operation Selection
         self.operation_combo = QtWidgets.QComboBox()
-        self.operation_combo.addItems(['Search & Replace','Insert/Overwrite','Numbering'])
+        self.operation_combo.addItems(['Search & Replace','Insert/Overwrite','Numbering','Change Case','Trim','Arnold ROP'])
 
         self.search_replace_ui()
         self.insert_overwrite_ui()
         self.numbering_ui()
+        self.case_ui()
+        self.trim_ui()
         self.arnold_rop_ui()
+        self.operation_widgets = [self.search_replace_widget,
+                                  self.insert_overwrite_widget,
+                                  self.numbering_widget,
+                                  self.case_widget,
+                                  self.trim_widget,
+                                  self.arnold_rop_widget]
+        rule_chain_layout = self.rule_chain_ui()
 
         #Edit Undo Buttons
         self.node_name_undo_button = QtWidgets.QPushButton('Undo')
+        self.node_name_redo_button = QtWidgets.QPushButton('Redo')
         self.node_name_edit_button = QtWidgets.QPushButton('Edit')
         edit_undo_layout = QtWidgets.QHBoxLayout()
         edit_undo_layout.addWidget(self.node_name_undo_button)
+        edit_undo_layout.addWidget(self.node_name_redo_button)
         edit_undo_layout.addWidget(self.node_name_edit_button)
 
         #Other Options
@@ -503,20 +894,27 @@ class Check_OTL_Defaults_UI():
         self.insert_overwrite_widget.setVisible(0)
         main_layout.addWidget(self.numbering_widget,2,1)
         self.numbering_widget.setVisible(0)
+        main_layout.addWidget(self.case_widget,2,1)
+        self.case_widget.setVisible(0)
+        main_layout.addWidget(self.trim_widget,2,1)
+        self.trim_widget.setVisible(0)
 
         main_layout.addWidget(self.arnold_rop_widget,2,1)
         self.arnold_rop_widget.setVisible(0)
         main_layout.addLayout(other_options_layout,2,2)
+        main_layout.addLayout(rule_chain_layout,3,0)
         main_layout.addLayout(edit_undo_layout,3,1)
         main_layout.addLayout(rename_layout,4,2)
 
         #Widget
         widget.setLayout(main_layout)
 
-for window in QtGui.QGuiApplication.topLevelWindows():
-    if window.objectName()== 'Copy_RenamerClassWindow':
-        hou.ui.removeAllSelectionCallbacks()
-        window.close()
+##Launch UI
+if __name__ =="__main__":
+    for window in QtGui.QGuiApplication.topLevelWindows():
+        if window.objectName()== 'Copy_RenamerClassWindow':
+            hou.ui.removeAllSelectionCallbacks()
+            window.close()
 
-Check_OTL_Defaults_dialog = Copy_Renamer()
-Check_OTL_Defaults_dialog.show()
\ No newline at end of file
+    Check_OTL_Defaults_dialog = Copy_Renamer()
+    Check_OTL_Defaults_dialog.show()
\ No newline at end of file
@@ -0,0 +1,540 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Houdini 19.0.622 Python 3
+####Version: 1.0
+####Note: Qt and hou free rename planning used by the Copy Renamer tool.
+####      Rules take the full list of names and return every new name in one pass.
+
+import collections
+import functools
+import json
+import os
+import re
+
+NUMBERING_CHARS = '0123456789_'
+#Characters setName accepts, anything else (or an empty name) raises hou.OperationFailed
+VALID_NODE_NAME = re.compile(r'[A-Za-z0-9_.\-]+\Z')
+
+
+#Utilities
+def trim_numbering(name):
+    return name.rstrip(NUMBERING_CHARS)
+
+def delete_text(name,start,stop):
+    #Same result as del on a list slice, empty when the slice runs backwards.
+    start,stop,step = slice(start,stop).indices(len(name))
+    if stop <= start:
+        return name
+    return name[:start]+name[stop:]
+
+@functools.lru_cache(maxsize=64)
+def compile_pattern(pattern,ignore_case=False):
+    return re.compile(pattern,re.IGNORECASE if ignore_case else 0)
+
+class Path_Template():
+    #Splits a template such as "$JOB/render/{seq}/{shot}/{name}.$F4.exr" into literal and token parts once.
+    TOKEN = re.compile(r'\{(\w+)\}')
+
+    def __init__(self,template):
+        self.template = template
+        self.parts = []
+        self.tokens = set()
+        position = 0
+        for match in self.TOKEN.finditer(template):
+            if match.start() > position:
+                self.parts.append((False,template[position:match.start()]))
+            self.parts.append((True,match.group(1)))
+            self.tokens.add(match.group(1))
+            position = match.end()
+        if position < len(template):
+            self.parts.append((False,template[position:]))
+
+    def render(self,tokens):
+        return ''.join(tokens.get(text,'') if is_token else text for is_token,text in self.parts)
+
+@functools.lru_cache(maxsize=64)
+def compile_template(template):
+    return Path_Template(template)
+
+def insert_text(name,text,position,overwrite=False,from_right=False,spacing=False):
+    if spacing:
+        if position == 0 or position >= len(name):
+            if from_right:
+                if position >= len(name):
+                    text += '_'
+                else:
+                    text = '_'+text
+            else:
+                if position >= len(name):
+                    text = '_'+text
+                else:
+                    text += '_'
+        else:
+            text = '_'+text+'_'
+    if overwrite:
+        if len(text) == len(name):
+            name = ''
+        else:
+            if from_right:
+                if position == 0 or position >= len(name)-1:
+                    name = delete_text(name,len(name)-len(text),len(name))
+                else:
+                    name = delete_text(name,len(name)-len(text)-position,len(name)-position)
+            else:
+                if position >= len(name)-1:
+                    name = delete_text(name,len(name)-len(text),len(name))
+                else:
+                    name = delete_text(name,position,len(text)+position)
+    if from_right:
+        if position == 0:
+            name += text
+        else:
+            name = name[:(position*-1)]+text+name[(position*-1):]
+    else:
+        name = name[:position]+text+name[position:]
+    return name
+
+
+#Rules
+class Rename_Rule():
+    #Rules rename one name at a time so a pipeline can stream every name through all of them.
+    trim_first = True
+    #Set when the rule's settings are invalid, the rule is then inactive
+    error = None
+
+    def is_active(self):
+        return True
+
+    def rename(self,name,i):
+        return name
+
+    def apply(self,names):
+        rename = self.rename
+        return [rename(name,i) for i,name in enumerate(names)]
+
+    def label(self):
+        return self.__class__.__name__
+
+class Search_Replace_Rule(Rename_Rule):
+    #Search & Replace works on the untrimmed name, numbering is trimmed afterwards.
+    trim_first = False
+
+    def __init__(self,search,replace,count=0):
+        self.search = search
+        self.replace = replace
+        self.count = count if count else -1
+
+    def is_active(self):
+        return self.search != ''
+
+    def rename(self,name,i):
+        return name.replace(self.search,self.replace,self.count)
+
+    def label(self):
+        return 'Replace "{}" with "{}"'.format(self.search,self.replace)
+
+class Regex_Replace_Rule(Rename_Rule):
+    trim_first = False
+
+    def __init__(self,pattern,replace,count=0,ignore_case=False):
+        self.pattern = pattern
+        self.replace = replace
+        self.count = count
+        self.regex = None
+        if pattern == '':
+            return
+        try:
+            regex = compile_pattern(pattern,ignore_case)
+            #The replacement template is only parsed on use, a bad group reference would raise in rename
+            regex.sub(replace,'')
+            self.regex = regex
+        except re.error as error:
+            self.error = 'Invalid regex: {}'.format(error)
+
+    def is_active(self):
+        return self.regex is not None
+
+    def rename(self,name,i):
+        return self.regex.sub(self.replace,name,self.count)
+
+    def label(self):
+        return 'Regex "{}" to "{}"'.format(self.pattern,self.replace)
+
+class Insert_Overwrite_Rule(Rename_Rule):
+    def __init__(self,text,position=0,overwrite=False,from_right=False,spacing=False):
+        self.text = text
+        self.position = position
+        self.overwrite = overwrite
+        self.from_right = from_right
+        self.spacing = spacing
+
+    def is_active(self):
+        return self.text != ''
+
+    def rename(self,name,i):
+        return insert_text(name,self.text,self.position,self.overwrite,self.from_right,self.spacing)
+
+    def label(self):
+        return '{} "{}" at {}'.format('Overwrite' if self.overwrite else 'Insert',self.text,self.position)
+
+class Numbering_Rule(Rename_Rule):
+    def __init__(self,start=1,padding=2,position=0,overwrite=False,from_right=False,spacing=False,enabled=True):
+        self.start = start
+        self.padding = padding
+        self.position = position
+        self.overwrite = overwrite
+        self.from_right = from_right
+        self.spacing = spacing
+        self.enabled = enabled
+
+    def is_active(self):
+        return self.enabled
+
+    def rename(self,name,i):
+        number = str(self.start+i).rjust(self.padding,'0')
+        return insert_text(name,number,self.position,self.overwrite,self.from_right,self.spacing)
+
+    def label(self):
+        return 'Number from {} padded {}'.format(self.start,self.padding)
+
+class Case_Rule(Rename_Rule):
+    MODES = {'lower':str.lower,'upper':str.upper,'title':str.title,'capitalize':str.capitalize}
+
+    def __init__(self,mode=''):
+        self.mode = mode
+        self.function = self.MODES.get(mode)
+
+    def is_active(self):
+        return self.function is not None
+
+    def rename(self,name,i):
+        return self.function(name)
+
+    def label(self):
+        return 'Case {}'.format(self.mode)
+
+class Trim_Rule(Rename_Rule):
+    def __init__(self,left=0,right=0):
+        self.left = left
+        self.right = right
+
+    def is_active(self):
+        return self.left > 0 or self.right > 0
+
+    def rename(self,name,i):
+        return name[self.left:len(name)-self.right]
+
+    def label(self):
+        return 'Trim {} left, {} right'.format(self.left,self.right)
+
+class Template_Rule(Rename_Rule):
+    #Builds the name from a template, {name} is the current name.
+    #row_filter(i) limits the rule to some rows, it is asked on every pass so it can follow a changing row list.
+    def __init__(self,template='{name}',tokens=None,row_filter=None):
+        self.template = compile_template(template)
+        self.tokens = dict(tokens or {})
+        self.row_filter = row_filter
+
+    def is_active(self):
+        return self.template.template not in ('','{name}')
+
+    def rename(self,name,i):
+        if self.row_filter is not None and not self.row_filter(i):
+            return name
+        tokens = self.tokens
+        tokens['name'] = name
+        return self.template.render(tokens)
+
+    def label(self):
+        return 'Template "{}"'.format(self.template.template)
+
+class Rule_Pipeline(Rename_Rule):
+    #Runs an ordered chain of rules over every name in a single pass.
+    def __init__(self,rules=()):
+        self.rules = [rule for rule in rules if rule is not None and rule.is_active()]
+
+    def is_active(self):
+        return bool(self.rules)
+
+    def rename(self,name,i):
+        for rule in self.rules:
+            name = rule.rename(name,i)
+        return name
+
+    def apply(self,names):
+        renames = [rule.rename for rule in self.rules]
+        new_names = []
+        for i,name in enumerate(names):
+            for rename in renames:
+                name = rename(name,i)
+            new_names.append(name)
+        return new_names
+
+    def label(self):
+        return ' > '.join(rule.label() for rule in self.rules)
+
+
+#Planning
+class Rename_Plan():
+    __slots__ = ('names','new_names','changed')
+
+    def __init__(self,names,new_names,changed):
+        self.names = names
+        self.new_names = new_names
+        self.changed = changed
+
+    def __len__(self):
+        return len(self.new_names)
+
+def trim_names(names,trim=True):
+    if not trim:
+        return list(names)
+    return [name.rstrip(NUMBERING_CHARS) for name in names]
+
+def trim_split(rule):
+    #Rules before the first trim_first rule see the untrimmed names
+    rules = rule.rules if isinstance(rule,Rule_Pipeline) else [rule]
+    for index,each in enumerate(rules):
+        if each.trim_first:
+            return rules[:index],rules[index:]
+    return rules,[]
+
+def plan_renames(names,rule=None,trim=False,trimmed=None):
+    names = list(names)
+    if trimmed is None:
+        trimmed = trim_names(names,trim)
+    if rule is None or not rule.is_active():
+        return Rename_Plan(names,list(trimmed),[False]*len(names))
+
+    #Trim Numbering runs once, right before the first rule that works on trimmed names
+    before,after = trim_split(rule)
+    if not before:
+        new_names = Rule_Pipeline(after).apply(trimmed)
+        changed = [new != old for new,old in zip(new_names,trimmed)]
+        return Rename_Plan(names,new_names,changed)
+
+    applied = Rule_Pipeline(before).apply(names)
+    changed = [new != old for new,old in zip(applied,names)]
+    new_names = trim_names(applied,trim)
+    if after:
+        trimmed = new_names
+        new_names = Rule_Pipeline(after).apply(trimmed)
+        changed = [changed[i] or new_names[i] != trimmed[i] for i in range(len(names))]
+    return Rename_Plan(names,new_names,changed)
+
+
+#Resolving
+class Rename_Resolution():
+    __slots__ = ('final_names','collisions','invalid','steps')
+
+    def __init__(self,final_names,collisions,invalid,steps):
+        self.final_names = final_names
+        self.collisions = collisions
+        self.invalid = invalid
+        self.steps = steps
+
+def valid_node_name(name):
+    return VALID_NODE_NAME.match(name) is not None
+
+def unique_name(name,taken):
+    if name not in taken:
+        return name
+    base = name.rstrip('0123456789')
+    digits = name[len(base):]
+    number = int(digits)+1 if digits else 1
+    while base+str(number) in taken:
+        number += 1
+    return base+str(number)
+
+def resolve_renames(old_names,new_names,sibling_names,temp_prefix='db3d_tmp'):
+    #Plans a batch of renames inside one network without relying on setName(unique_name=True).
+    #Returns the final name of every row, the rows that had to be renumbered because they
+    #collided, the rows whose new name Houdini would refuse, and (row,name) steps in an order
+    #that never asks for a name still in use.
+    old_names = list(old_names)
+    final_names = list(new_names)
+    count = len(old_names)
+    #Refused names keep the old name so the steps never fail halfway through a cycle
+    invalid = [i for i in range(count) if final_names[i] != old_names[i] and not valid_node_name(final_names[i])]
+    for i in invalid:
+        final_names[i] = old_names[i]
+    moving = [i for i in range(count) if final_names[i] != old_names[i]]
+
+    #Names held by siblings outside the batch and by rows that keep their name
+    taken = set(sibling_names).difference(old_names)
+    for i in range(count):
+        if final_names[i] == old_names[i]:
+            taken.add(old_names[i])
+    avoid = taken.union(final_names)
+
+    collisions = []
+    for i in moving:
+        name = final_names[i]
+        if name in taken:
+            name = unique_name(name,avoid)
+            avoid.add(name)
+            collisions.append(i)
+            final_names[i] = name
+        taken.add(name)
+    moving = [i for i in moving if final_names[i] != old_names[i]]
+
+    #Order the renames, breaking cycles such as A->B, B->A with a temporary name
+    holders = {}
+    current = {}
+    for i in moving:
+        holders[old_names[i]] = i
+        current[i] = old_names[i]
+    waiting = {}
+    ready = collections.deque()
+    for i in moving:
+        if final_names[i] in holders:
+            waiting[final_names[i]] = i
+        else:
+            ready.append(i)
+
+    steps = []
+    all_names = avoid.union(sibling_names,old_names)
+    temp_count = 0
+    while ready or waiting:
+        while ready:
+            i = ready.popleft()
+            steps.append((i,final_names[i]))
+            freed = current.pop(i)
+            del holders[freed]
+            if freed in waiting:
+                ready.append(waiting.pop(freed))
+        if waiting:
+            name = next(iter(waiting))
+            j = holders.pop(name)
+            temp_count += 1
+            temp = unique_name(temp_prefix+str(temp_count),all_names)
+            all_names.add(temp)
+            steps.append((j,temp))
+            holders[temp] = j
+            current[j] = temp
+            ready.append(waiting.pop(name))
+    return Rename_Resolution(final_names,collisions,invalid,steps)
+
+
+#Journal
+class Journal_Step():
+    __slots__ = ('keys','before','after')
+
+    def __init__(self,keys,before,after):
+        self.keys = keys
+        self.before = before
+        self.after = after
+
+class Rename_Journal():
+    #Staged names keyed by node, each step only records the names it changed.
+    def __init__(self,max_steps=100):
+        self.current = {}
+        self.undo_steps = collections.deque(maxlen=max_steps)
+        self.redo_steps = []
+
+    def add(self,key,name):
+        self.current[key] = name
+
+    def remove(self,key):
+        self.current.pop(key,None)
+
+    def clear(self):
+        self.current = {}
+        self.undo_steps.clear()
+        self.redo_steps = []
+
+    def name(self,key):
+        return self.current[key]
+
+    def names(self,keys):
+        current = self.current
+        return [current[key] for key in keys]
+
+    def stage(self,keys,new_names):
+        current = self.current
+        changed = [(key,current[key],name) for key,name in zip(keys,new_names) if current[key] != name]
+        if not changed:
+            return None
+        step_keys,before,after = zip(*changed)
+        step = Journal_Step(step_keys,before,after)
+        self.apply_step(step.keys,step.after)
+        self.undo_steps.append(step)
+        self.redo_steps = []
+        return step
+
+    def undo(self):
+        if not self.undo_steps:
+            return None
+        step = self.undo_steps.pop()
+        self.apply_step(step.keys,step.before)
+        self.redo_steps.append(step)
+        return step
+
+    def redo(self):
+        if not self.redo_steps:
+            return None
+        step = self.redo_steps.pop()
+        self.apply_step(step.keys,step.after)
+        self.undo_steps.append(step)
+        return step
+
+    def apply_step(self,keys,names):
+        current = self.current
+        for key,name in zip(keys,names):
+            #Nodes dropped from the selection keep their place in history but are skipped
+            if key in current:
+                current[key] = name
+
+
+#Rule Sets
+RULE_TYPES = {'search_replace':Search_Replace_Rule,
+              'regex':Regex_Replace_Rule,
+              'insert_overwrite':Insert_Overwrite_Rule,
+              'numbering':Numbering_Rule,
+              'case':Case_Rule,
+              'trim':Trim_Rule,
+              'template':Template_Rule}
+
+def rule_from_dict(data):
+    data = dict(data)
+    rule_type = data.pop('type')
+    if rule_type not in RULE_TYPES:
+        raise ValueError('Unknown rename rule type: {}'.format(rule_type))
+    rule = RULE_TYPES[rule_type](**data)
+    #An invalid rule would silently drop out of the pipeline and the batch would rename nothing
+    if rule.error:
+        raise ValueError('{} rule: {}'.format(rule_type,rule.error))
+    return rule
+
+def pipeline_from_dict(data):
+    #A rule set is either a list of rules or {"trim_numbering":bool,"rules":[...]}
+    if isinstance(data,list):
+        data = {'rules':data}
+    pipeline = Rule_Pipeline([rule_from_dict(rule) for rule in data.get('rules',[])])
+    return pipeline,bool(data.get('trim_numbering',False))
+
+def load_rule_set(path):
+    with open(path) as rule_file:
+        return json.load(rule_file)
+
+
+#Shots
+@functools.lru_cache(maxsize=8)
+def scan_shots(root):
+    #Sequences are the folders in root and shots the folders in each sequence, scanned once per root.
+    shots = []
+    if not root or not os.path.isdir(root):
+        return tuple(shots)
+    for seq in sorted(os.listdir(root)):
+        seq_path = os.path.join(root,seq)
+        if seq.startswith('.') or not os.path.isdir(seq_path):
+            continue
+        shots.append((seq,tuple(shot for shot in sorted(os.listdir(seq_path)) if not shot.startswith('.') and os.path.isdir(os.path.join(seq_path,shot)))))
+    return tuple(shots)
+
+def find_shots(root,refresh=False):
+    #Cached per root, refresh rescans the disk for sequences and shots added since
+    if refresh:
+        scan_shots.cache_clear()
+    return collections.OrderedDict((seq,list(shots)) for seq,shots in scan_shots(root))
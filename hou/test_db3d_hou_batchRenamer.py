@@ -0,0 +1,185 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Python 3
+####Script: hou_batchRenamer tests
+####Version: 1.0
+####Note: Runs the batch renamer against a stand-in hou module, no Houdini needed.
+####Usage: python -m unittest discover hou
+
+import os
+import sys
+import types
+import unittest
+
+sys.path.insert(0,os.path.dirname(os.path.abspath(__file__)))
+
+import db3d_hou_batchRenamer as batchRenamer
+
+class OperationFailed(Exception):
+    pass
+
+class Stand_In_Node(object):
+    #Refuses the same names setName does, a bad step order shows up as an error
+    def __init__(self,name,parent=None,locked=False):
+        self.node_name = name
+        self.parent_node = parent
+        self.child_nodes = []
+        self.locked = locked
+        self.renames = []
+        if parent is not None:
+            parent.child_nodes.append(self)
+
+    def name(self):
+        return self.node_name
+
+    def path(self):
+        if self.parent_node is None:
+            return '/'+self.node_name
+        return self.parent_node.path()+'/'+self.node_name
+
+    def children(self):
+        return tuple(self.child_nodes)
+
+    def allSubChildren(self):
+        nodes = []
+        for child in self.child_nodes:
+            nodes.append(child)
+            nodes.extend(child.allSubChildren())
+        return tuple(nodes)
+
+    def isLockedHDA(self):
+        return self.locked
+
+    def isInsideLockedHDA(self):
+        parent = self.parent_node
+        while parent is not None:
+            if parent.locked:
+                return True
+            parent = parent.parent_node
+        return False
+
+    def setName(self,name):
+        if self.isInsideLockedHDA():
+            raise OperationFailed('Node is inside a locked asset')
+        if not batchRenamer.planner.valid_node_name(name):
+            raise OperationFailed('Invalid node name')
+        if any(sibling.node_name == name for sibling in self.parent_node.child_nodes if sibling is not self):
+            raise OperationFailed('Node name already in use')
+        self.renames.append(name)
+        self.node_name = name
+
+def network(names,parent=None):
+    root = Stand_In_Node('obj',parent)
+    for name in names:
+        Stand_In_Node(name,root)
+    return root
+
+def child_names(root):
+    return sorted(child.name() for child in root.children())
+
+def replace_rules(*pairs):
+    return [{'type':'regex','pattern':'^{}$'.format(old),'replace':new} for old,new in pairs]
+
+class Rename_Network_Test(unittest.TestCase):
+    def rename(self,root,rule_set,dry_run=False):
+        pipeline,trim = batchRenamer.planner.pipeline_from_dict(rule_set)
+        return batchRenamer.rename_network(root,pipeline,trim,dry_run)
+
+    def test_swap(self):
+        root = network(['a','b','c'])
+        report = self.rename(root,replace_rules(('a','tmp'),('b','a'),('tmp','b')))
+        self.assertEqual(sorted(report['renames']),[['a','b'],['b','a']])
+        self.assertEqual(report['collisions'],[])
+        self.assertEqual([child.name() for child in root.children()],['b','a','c'])
+
+    def test_rotation(self):
+        root = network(['a','b','c'])
+        report = self.rename(root,replace_rules(('a','tmp'),('c','a'),('b','c'),('tmp','b')))
+        self.assertEqual(len(report['renames']),3)
+        self.assertEqual([child.name() for child in root.children()],['b','c','a'])
+        #One temp name breaks the cycle and is renamed again
+        self.assertEqual(sum(len(child.renames) for child in root.children()),4)
+
+    def test_collision_is_renumbered(self):
+        root = network(['a','b'])
+        report = self.rename(root,replace_rules(('a','b')))
+        self.assertEqual(report['collisions'],['a'])
+        self.assertEqual(report['renames'],[['a','b1']])
+        self.assertEqual(child_names(root),['b','b1'])
+
+    def test_numbering_follows_name_order(self):
+        root = network(['geo_c','geo_a','geo_b'])
+        self.rename(root,{'trim_numbering':True,'rules':[{'type':'numbering','start':1,'padding':2,'position':0,'from_right':True}]})
+        self.assertEqual([child.name() for child in root.children()],['geo_c03','geo_a01','geo_b02'])
+
+    def test_dry_run(self):
+        root = network(['a','b'])
+        report = self.rename(root,replace_rules(('a','tmp'),('b','a'),('tmp','b')),dry_run=True)
+        self.assertEqual(sorted(report['renames']),[['a','b'],['b','a']])
+        self.assertEqual(child_names(root),['a','b'])
+        self.assertFalse(any(child.renames for child in root.children()))
+
+    def test_invalid_names_are_left_alone(self):
+        root = network(['abc','bb'])
+        report = self.rename(root,[{'type':'trim','left':0,'right':2}])
+        self.assertEqual(report['invalid'],[['bb','']])
+        self.assertEqual(report['renames'],[['abc','a']])
+        self.assertEqual(child_names(root),['a','bb'])
+
+class Network_List_Test(unittest.TestCase):
+    def setUp(self):
+        self.root = network(['geo'])
+        subnet = Stand_In_Node('subnet',self.root)
+        Stand_In_Node('inside',subnet)
+        hda = Stand_In_Node('hda',self.root,locked=True)
+        locked_subnet = Stand_In_Node('locked_subnet',hda)
+        Stand_In_Node('locked_inside',locked_subnet)
+        self.hou = types.SimpleNamespace(node=lambda path: self.root if path == '/obj' else None)
+
+    def test_children_only(self):
+        self.assertEqual([node.path() for node in batchRenamer.network_list(self.hou,['/obj','/missing'])],['/obj'])
+
+    def test_recursive_skips_locked_assets(self):
+        networks = batchRenamer.network_list(self.hou,['/obj'],recursive=True)
+        self.assertEqual([node.path() for node in networks],['/obj','/obj/subnet'])
+
+class Process_Hip_Test(unittest.TestCase):
+    def setUp(self):
+        self.root = network(['a','b'])
+        self.saved = []
+        hou = types.ModuleType('hou')
+        hou.node = lambda path: self.root if path == '/obj' else None
+        hou.hipFile = types.SimpleNamespace(load=lambda path,**kwargs: None,save=lambda: self.saved.append(True))
+        self.hou = sys.modules.get('hou')
+        sys.modules['hou'] = hou
+        self.environ = os.environ.pop('DB3D_PROFILE',None)
+
+    def tearDown(self):
+        if self.hou is None:
+            sys.modules.pop('hou',None)
+        else:
+            sys.modules['hou'] = self.hou
+        if self.environ is not None:
+            os.environ['DB3D_PROFILE'] = self.environ
+
+    def test_saves_when_renamed(self):
+        report = batchRenamer.process_hip('shot.hip',replace_rules(('a','c')),['/obj'])
+        self.assertIsNone(report['error'])
+        self.assertTrue(report['saved'])
+        self.assertEqual(self.saved,[True])
+        self.assertEqual(child_names(self.root),['b','c'])
+
+    def test_dry_run_does_not_save(self):
+        report = batchRenamer.process_hip('shot.hip',replace_rules(('a','c')),['/obj'],dry_run=True)
+        self.assertFalse(report['saved'])
+        self.assertEqual(self.saved,[])
+        self.assertEqual(report['networks'][0]['renames'],[['a','c']])
+
+    def test_bad_rule_set_is_reported(self):
+        report = batchRenamer.process_hip('shot.hip',[{'type':'regex','pattern':'(','replace':''}],['/obj'])
+        self.assertTrue(report['error'].startswith('ValueError: regex rule'))
+        self.assertEqual(self.saved,[])
+
+if __name__ =="__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Python 3
+####Script: hou_renamePlanner tests
+####Version: 1.0
+####Note: The rename planner is Qt and hou free, these run with plain Python.
+####Usage: python -m unittest discover hou
+
+import itertools
+import os
+import sys
+import unittest
+
+sys.path.insert(0,os.path.dirname(os.path.abspath(__file__)))
+
+import db3d_hou_renamePlanner as planner
+
+def legacy_insert_text(name,text,position,ui_insert_overwrite,ui_position,ui_spacing):
+    #Copy_Renamer.util_insert_text before the planner, without the table item
+    if ui_spacing:
+        if position == 0 or position >= len(name):
+            if ui_position:
+                if position >= len(name):
+                    text += '_'
+                else:
+                    text = '_'+text
+            else:
+                if position >= len(name):
+                    text = '_'+text
+                else:
+                    text += '_'
+        else:
+            text = '_'+text+'_'
+    if ui_insert_overwrite:
+        if len(text) == len(name):
+            name = ''
+        else:
+            name = list(name)
+            if ui_position:
+                if position == 0 or position >= len(name)-1:
+                    del name[(len(name)-len(text)):len(name)]
+                else:
+                    del name[(len(name)-len(text)-position):(len(name)-position)]
+            else:
+                if position >= len(name)-1:
+                    del name[(len(name)-len(text)):len(name)]
+                else:
+                    del name[position:(len(text)+position)]
+            name = ''.join(name)
+    if ui_position:
+        if position == 0:
+            name += text
+        else:
+            name = name[:(position*-1)]+text+name[(position*-1):]
+    else:
+        name = name[:position]+text+name[position:]
+    return name
+
+def run_steps(old_names,sibling_names,steps):
+    #Applies the steps like setName would, failing on a name that is still taken
+    names = list(old_names)
+    taken = set(sibling_names).union(old_names)
+    for row,name in steps:
+        if name in taken:
+            raise AssertionError('{} is still in use'.format(name))
+        taken.discard(names[row])
+        taken.add(name)
+        names[row] = name
+    return names
+
+class Insert_Text_Test(unittest.TestCase):
+    def test_matches_legacy(self):
+        names = ['','a','geo','geo_01','character_body']
+        texts = ['x','new','01']
+        for name,text,position,overwrite,from_right,spacing in itertools.product(names,texts,range(0,16),(False,True),(False,True),(False,True)):
+            self.assertEqual(planner.insert_text(name,text,position,overwrite,from_right,spacing),
+                             legacy_insert_text(name,text,position,overwrite,from_right,spacing),
+                             (name,text,position,overwrite,from_right,spacing))
+
+class Plan_Renames_Test(unittest.TestCase):
+    def test_no_rule_returns_trimmed(self):
+        plan = planner.plan_renames(['geo_01','box2'],None,trim=True)
+        self.assertEqual(plan.new_names,['geo','box'])
+        self.assertEqual(plan.changed,[False,False])
+
+    def test_trim_split(self):
+        replace = planner.Search_Replace_Rule('a','b')
+        numbering = planner.Numbering_Rule(1,2,0,False,True)
+        case = planner.Case_Rule('upper')
+        self.assertEqual(planner.trim_split(planner.Rule_Pipeline([replace,numbering,case])),([replace],[numbering,case]))
+        self.assertEqual(planner.trim_split(planner.Rule_Pipeline([numbering,replace])),([],[numbering,replace]))
+        self.assertEqual(planner.trim_split(replace),([replace],[]))
+
+    def test_trim_before_first_trimmed_rule(self):
+        pipeline = planner.Rule_Pipeline([planner.Search_Replace_Rule('a','b'),planner.Numbering_Rule(1,2,0,False,True)])
+        plan = planner.plan_renames(['a_01','a_02'],pipeline,trim=True)
+        self.assertEqual(plan.new_names,['b01','b02'])
+        self.assertEqual(plan.changed,[True,True])
+
+    def test_replace_sees_untrimmed_names(self):
+        plan = planner.plan_renames(['geo_01','geo_02'],planner.Search_Replace_Rule('_01','_10'),trim=True)
+        self.assertEqual(plan.new_names,['geo','geo'])
+        self.assertEqual(plan.changed,[True,False])
+
+    def test_changed_against_trimmed(self):
+        plan = planner.plan_renames(['geo1','box'],planner.Case_Rule('upper'),trim=True,trimmed=['geo','box'])
+        self.assertEqual(plan.new_names,['GEO','BOX'])
+        self.assertEqual(plan.changed,[True,True])
+
+    def test_invalid_regex_is_inactive(self):
+        rule = planner.Regex_Replace_Rule('(','x')
+        self.assertFalse(rule.is_active())
+        self.assertTrue(rule.error.startswith('Invalid regex'))
+        self.assertTrue(planner.Regex_Replace_Rule('a',r'\1').error)
+        with self.assertRaises(ValueError):
+            planner.pipeline_from_dict([{'type':'regex','pattern':'(','replace':''}])
+
+class Resolve_Renames_Test(unittest.TestCase):
+    def resolve(self,old_names,new_names,sibling_names=()):
+        sibling_names = set(sibling_names).union(old_names)
+        resolution = planner.resolve_renames(old_names,new_names,sibling_names)
+        self.assertEqual(run_steps(old_names,sibling_names,resolution.steps),resolution.final_names)
+        return resolution
+
+    def test_swap(self):
+        resolution = self.resolve(['a','b'],['b','a'])
+        self.assertEqual(resolution.final_names,['b','a'])
+        self.assertEqual(resolution.collisions,[])
+        self.assertEqual(len(resolution.steps),3)
+        self.assertTrue(resolution.steps[0][1].startswith('db3d_tmp'))
+
+    def test_rotation(self):
+        resolution = self.resolve(['a','b','c'],['b','c','a'])
+        self.assertEqual(resolution.final_names,['b','c','a'])
+        self.assertEqual(len(resolution.steps),4)
+
+    def test_chain_needs_no_temp(self):
+        resolution = self.resolve(['a','b'],['b','c'])
+        self.assertEqual(resolution.steps,[(1,'c'),(0,'b')])
+
+    def test_duplicate_targets(self):
+        resolution = self.resolve(['a','b','c'],['x','x','x'])
+        self.assertEqual(resolution.final_names,['x','x1','x2'])
+        self.assertEqual(resolution.collisions,[1,2])
+
+    def test_sibling_outside_batch(self):
+        resolution = self.resolve(['a'],['geo'],['geo','geo1'])
+        self.assertEqual(resolution.final_names,['geo2'])
+        self.assertEqual(resolution.collisions,[0])
+
+    def test_kept_name_blocks_target(self):
+        resolution = self.resolve(['a','b'],['b','b'])
+        self.assertEqual(resolution.final_names,['b1','b'])
+        self.assertEqual(resolution.collisions,[0])
+
+    def test_invalid_names(self):
+        resolution = self.resolve(['a','b','c'],['','b c','d'])
+        self.assertEqual(resolution.invalid,[0,1])
+        self.assertEqual(resolution.final_names,['a','b','d'])
+        self.assertEqual(resolution.steps,[(2,'d')])
+
+class Rename_Journal_Test(unittest.TestCase):
+    def setUp(self):
+        self.journal = planner.Rename_Journal()
+        for key,name in ((1,'a'),(2,'b'),(3,'c')):
+            self.journal.add(key,name)
+
+    def test_undo_redo(self):
+        self.journal.stage([1,2,3],['x','b','y'])
+        self.journal.stage([1,2,3],['x','z','y'])
+        self.assertEqual(self.journal.names([1,2,3]),['x','z','y'])
+        step = self.journal.undo()
+        self.assertEqual(step.keys,(2,))
+        self.assertEqual(self.journal.names([1,2,3]),['x','b','y'])
+        self.journal.undo()
+        self.assertEqual(self.journal.names([1,2,3]),['a','b','c'])
+        self.assertIsNone(self.journal.undo())
+        self.journal.redo()
+        self.assertEqual(self.journal.names([1,2,3]),['x','b','y'])
+
+    def test_stage_clears_redo(self):
+        self.journal.stage([1],['x'])
+        self.journal.undo()
+        self.journal.stage([2],['y'])
+        self.assertIsNone(self.journal.redo())
+        self.assertEqual(self.journal.names([1,2]),['a','y'])
+
+    def test_unchanged_stage_is_not_recorded(self):
+        self.assertIsNone(self.journal.stage([1,2],['a','b']))
+        self.assertIsNone(self.journal.undo())
+
+    def test_removed_keys_are_skipped(self):
+        self.journal.stage([1,2],['x','y'])
+        self.journal.remove(2)
+        self.journal.undo()
+        self.assertEqual(self.journal.names([1]),['a'])
+        self.journal.add(2,'b')
+        self.journal.redo()
+        self.assertEqual(self.journal.names([1,2]),['x','y'])
+
+    def test_max_steps(self):
+        journal = planner.Rename_Journal(max_steps=2)
+        journal.add(1,'a')
+        for name in ('b','c','d'):
+            journal.stage([1],[name])
+        journal.undo()
+        journal.undo()
+        self.assertIsNone(journal.undo())
+        self.assertEqual(journal.name(1),'b')
+
+if __name__ =="__main__":
+    unittest.main()
@@ -5,6 +5,9 @@
 ####Script: maya_addAOVLightGrps
 ####Version: 1.0
 ####Note:Adds and removes direct and indirect light group AOVs.
+####     The group/AOV matrix is loaded from per show presets, see db3d_maya_aovLayout.
+
+import os
 
 from PySide2 import QtCore
 from PySide2 import QtWidgets
@@ -12,12 +15,97 @@ from shiboken2 import wrapInstance
 
 import maya.OpenMayaUI as omui
 import maya.cmds as cmds
-import mtoa.aovs as aovs
+
+import db3d_maya_aovLayout as aovLayout
 
 def maya_main_window():
     main_window_ptr = omui.MQtUtil.mainWindow()
     return wrapInstance(main_window_ptr, QtWidgets.QWidget)    
 
+class Aov_Matrix_Model(QtCore.QAbstractTableModel):
+    #Rows are light groups, columns are AOV types, checked cells are the AOVs to keep
+    def __init__(self, parent=None):
+        super(Aov_Matrix_Model, self).__init__(parent)
+        self.groups = []
+        self.aovs = []
+        self.matrix = {}
+
+    def set_layout(self, layout):
+        self.beginResetModel()
+        self.groups = list(layout['groups'])
+        self.aovs = list(layout['aovs'])
+        self.matrix = dict((group, set(layout['matrix'].get(group, []))) for group in self.groups)
+        self.endResetModel()
+
+    def update_layout(self, layout):
+        layout['groups'] = list(self.groups)
+        layout['aovs'] = list(self.aovs)
+        layout['matrix'] = dict((group, [aov for aov in self.aovs if aov in self.matrix[group]]) for group in self.groups if self.matrix[group])
+        return layout
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.groups)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.aovs)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or role != QtCore.Qt.CheckStateRole:
+            return None
+        checked = self.aovs[index.column()] in self.matrix[self.groups[index.row()]]
+        return QtCore.Qt.Checked if checked else QtCore.Qt.Unchecked
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.CheckStateRole:
+            return False
+        self.set_cells([index.row()], [index.column()], value == QtCore.Qt.Checked or value == int(QtCore.Qt.Checked))
+        return True
+
+    def flags(self, index):
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsUserCheckable
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self.aovs[section]
+        return self.groups[section]
+
+    def set_cells(self, rows, columns, checked):
+        for row in rows:
+            enabled = self.matrix[self.groups[row]]
+            for column in columns:
+                if checked:
+                    enabled.add(self.aovs[column])
+                else:
+                    enabled.discard(self.aovs[column])
+        if rows and columns:
+            self.dataChanged.emit(self.index(min(rows), min(columns)), self.index(max(rows), max(columns)), [QtCore.Qt.CheckStateRole])
+
+    def toggle_row(self, row):
+        columns = list(range(len(self.aovs)))
+        self.set_cells([row], columns, len(self.matrix[self.groups[row]]) < len(self.aovs))
+
+    def toggle_column(self, column):
+        aov = self.aovs[column]
+        rows = list(range(len(self.groups)))
+        self.set_cells(rows, [column], not all(aov in self.matrix[group] for group in self.groups))
+
+    def add_group(self, group):
+        if not group or group in self.matrix:
+            return False
+        self.beginInsertRows(QtCore.QModelIndex(), len(self.groups), len(self.groups))
+        self.groups.append(group)
+        self.matrix[group] = set()
+        self.endInsertRows()
+        return True
+
+    def remove_groups(self, rows):
+        for row in sorted(set(rows), reverse=True):
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            del self.matrix[self.groups.pop(row)]
+            self.endRemoveRows()
+
 class AddLgtGrps(QtWidgets.QDialog):    
     def __init__(self, parent=maya_main_window()):
         super(AddLgtGrps, self).__init__(parent)
@@ -26,47 +114,43 @@ class AddLgtGrps(QtWidgets.QDialog):
         self.setMinimumWidth(100)
         self.setWindowFlags(self.windowFlags() ^ QtCore.Qt.WindowContextHelpButtonHint)
 
+        self.layoutData = aovLayout.default_layout()
+
         self.create_widgets()
         self.create_layouts()
         self.create_connections()
+        self.load_show(aovLayout.current_show())
         
     def create_widgets(self):
-        ##AOVs
-        self.lblAov = QtWidgets.QLabel('AOVs:', self)
-        self.checkCoatDir = QtWidgets.QCheckBox('coat_direct', self)
-        self.checkCoatDir.toggle()
-        self.checkCoatInDir = QtWidgets.QCheckBox('coat_indirect', self)
-        self.checkCoatInDir.toggle()
-        self.checkDifDir = QtWidgets.QCheckBox('diffuse_direct', self)
-        self.checkDifDir.toggle()
-        self.checkDifInDir = QtWidgets.QCheckBox('diffuse_indirect', self)
-        self.checkDifInDir.toggle()
-        self.checkSpecDir = QtWidgets.QCheckBox('specular_direct', self)
-        self.checkSpecDir.toggle()
-        self.checkSpecInDir = QtWidgets.QCheckBox('specular_indirect', self)
-        self.checkSpecInDir.toggle()
-        self.checkTranDir = QtWidgets.QCheckBox('transmission_direct', self)
-        self.checkTranDir.toggle()
-        self.checkTranInDir = QtWidgets.QCheckBox('transmission_indirect', self)
-        self.checkTranInDir.toggle()
-
-        #Light Groups
-        self.lblLgtGrp = QtWidgets.QLabel('Light Groups:', self)
-        self.checkA = QtWidgets.QCheckBox('A')
-        self.checkA.toggle()
-        self.checkB = QtWidgets.QCheckBox('B', self)
-        self.checkC = QtWidgets.QCheckBox('C', self)
-        self.checkD = QtWidgets.QCheckBox('D', self)
-        self.checkE = QtWidgets.QCheckBox('E', self)
-        self.checkF = QtWidgets.QCheckBox('F', self)
-        self.checkG = QtWidgets.QCheckBox('G', self)
-        self.checkH = QtWidgets.QCheckBox('H', self)
-        self.checkI = QtWidgets.QCheckBox('I', self)
-        self.checkJ = QtWidgets.QCheckBox('J', self)
+        ##Presets
+        self.showLbl = QtWidgets.QLabel('Show:', self)
+        self.showCombo = QtWidgets.QComboBox(self)
+        self.showCombo.setEditable(True)
+        self.showCombo.addItems(aovLayout.list_presets())
+        self.loadBtn = QtWidgets.QPushButton('Load', self)
+        self.saveBtn = QtWidgets.QPushButton('Save', self)
+
+        ##AOV/Light Group Matrix
+        self.lblMatrix = QtWidgets.QLabel('Light Groups / AOVs:', self)
+        self.matrixModel = Aov_Matrix_Model(self)
+        self.matrixView = QtWidgets.QTableView(self)
+        self.matrixView.setModel(self.matrixModel)
+        self.matrixView.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.matrixView.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+        self.matrixView.verticalHeader().setSectionsClickable(True)
+        self.matrixView.setMinimumHeight(250)
+
+        self.groupEdit = QtWidgets.QLineEdit(self)
+        self.groupEdit.setPlaceholderText('Light group')
+        self.addGroupBtn = QtWidgets.QPushButton('Add Group', self)
+        self.removeGroupBtn = QtWidgets.QPushButton('Remove Selected', self)
 
         self.prefixLbl = QtWidgets.QLabel('Prefix:', self)
         self.prefixEdit = QtWidgets.QLineEdit('Lgt')
 
+        #Lights
+        self.assignBtn = QtWidgets.QPushButton('Assign Selected Group to Selected Lights', self)
+
         #Run Button
         self.run_btn = QtWidgets.QPushButton("Add AOVs")
         self.checkRemove = QtWidgets.QCheckBox('Remove Unchecked', self)
@@ -74,38 +158,23 @@ class AddLgtGrps(QtWidgets.QDialog):
          
     def create_layouts(self):
         form_layout = QtWidgets.QFormLayout()
-        #AOVs
-        form_layout.addRow(self.lblAov)
-        form_layout.addRow(self.checkCoatDir)
-        form_layout.addRow(self.checkCoatInDir)
-        form_layout.addRow(self.checkDifDir)
-        form_layout.addRow(self.checkDifInDir)
-        form_layout.addRow(self.checkSpecDir)
-        form_layout.addRow(self.checkSpecInDir)
-        form_layout.addRow(self.checkTranDir)
-        form_layout.addRow(self.checkTranInDir)
-        #Light Groups
-        form_layout.addRow(self.lblLgtGrp)
-
-        check_col1_layout = QtWidgets.QVBoxLayout()
-        check_col1_layout.addWidget(self.checkA)
-        check_col1_layout.addWidget(self.checkB)
-        check_col1_layout.addWidget(self.checkC)
-        check_col1_layout.addWidget(self.checkD)
-        check_col1_layout.addWidget(self.checkE)        
-
-        check_col2_layout = QtWidgets.QVBoxLayout()
-        check_col2_layout.addWidget(self.checkF)
-        check_col2_layout.addWidget(self.checkG)
-        check_col2_layout.addWidget(self.checkH)
-        check_col2_layout.addWidget(self.checkI)
-        check_col2_layout.addWidget(self.checkJ)          
-
-        check_layout = QtWidgets.QHBoxLayout()
-        check_layout.addLayout(check_col1_layout)
-        check_layout.addLayout(check_col2_layout)
-
-        form_layout.addRow(check_layout)
+        #Presets
+        preset_layout = QtWidgets.QHBoxLayout()
+        preset_layout.addWidget(self.showLbl)
+        preset_layout.addWidget(self.showCombo, 1)
+        preset_layout.addWidget(self.loadBtn)
+        preset_layout.addWidget(self.saveBtn)
+        form_layout.addRow(preset_layout)
+
+        #Matrix
+        form_layout.addRow(self.lblMatrix)
+        form_layout.addRow(self.matrixView)
+
+        group_layout = QtWidgets.QHBoxLayout()
+        group_layout.addWidget(self.groupEdit)
+        group_layout.addWidget(self.addGroupBtn)
+        group_layout.addWidget(self.removeGroupBtn)
+        form_layout.addRow(group_layout)
 
         prefix_layout = QtWidgets.QHBoxLayout()
         prefix_layout.addWidget(self.prefixLbl)
@@ -113,6 +182,9 @@ class AddLgtGrps(QtWidgets.QDialog):
 
         form_layout.addRow(prefix_layout)
 
+        #Lights
+        form_layout.addRow(self.assignBtn)
+
         #Run Button
         form_layout.addRow(self.run_btn)
         form_layout.addRow(self.checkRemove)
@@ -122,20 +194,64 @@ class AddLgtGrps(QtWidgets.QDialog):
 
     def create_connections(self):
         self.run_btn.clicked.connect(self.run)
+        self.loadBtn.clicked.connect(lambda: self.load_show(self.showCombo.currentText()))
+        self.saveBtn.clicked.connect(self.save_show)
+        self.addGroupBtn.clicked.connect(self.add_group)
+        self.groupEdit.returnPressed.connect(self.add_group)
+        self.removeGroupBtn.clicked.connect(self.remove_groups)
+        self.assignBtn.clicked.connect(self.assign_lights)
+        #Clicking a header toggles the whole group or AOV
+        self.matrixView.horizontalHeader().sectionClicked.connect(self.matrixModel.toggle_column)
+        self.matrixView.verticalHeader().sectionDoubleClicked.connect(self.matrixModel.toggle_row)
+
+    def current_layout(self):
+        self.layoutData['prefix'] = self.prefixEdit.text()
+        self.layoutData['remove_unchecked'] = self.checkRemove.isChecked()
+        return self.matrixModel.update_layout(self.layoutData)
+
+    def set_layout(self, layout):
+        self.layoutData = layout
+        self.prefixEdit.setText(layout['prefix'])
+        self.checkRemove.setChecked(layout.get('remove_unchecked', True))
+        self.matrixModel.set_layout(layout)
+
+    def load_show(self, show):
+        if not show:
+            return
+        path = aovLayout.preset_path(show)
+        layout = aovLayout.load_layout(path) if os.path.isfile(path) else aovLayout.default_layout()
+        self.set_layout(layout)
+        self.showCombo.setCurrentText(show)
+
+    def save_show(self):
+        show = self.showCombo.currentText()
+        if not show:
+            return
+        aovLayout.save_layout(self.current_layout(), aovLayout.preset_path(show))
+        if self.showCombo.findText(show) == -1:
+            self.showCombo.addItem(show)
+
+    def add_group(self):
+        if self.matrixModel.add_group(self.groupEdit.text().strip()):
+            self.groupEdit.clear()
+
+    def selected_rows(self):
+        return [index.row() for index in self.matrixView.selectionModel().selectedRows()]
+
+    def remove_groups(self):
+        self.matrixModel.remove_groups(self.selected_rows())
+
+    def assign_lights(self):
+        rows = self.selected_rows()
+        lights = cmds.ls(selection=True, long=True)
+        if len(rows) != 1 or not lights:
+            cmds.warning('Select one light group row and at least one light.')
+            return
+        assigned = aovLayout.assign_light_group(lights, self.current_layout(), self.matrixModel.groups[rows[0]])
+        print('Assigned light group to {} lights.'.format(len(assigned)))
 
     def run(self):
-        grpList = [self.checkA, self.checkB, self.checkC, self.checkD, self.checkE, self.checkF, self.checkG, self.checkH, self.checkI, self.checkJ]
-        aovList = [self.checkCoatDir, self.checkCoatInDir, self.checkDifDir, self.checkDifInDir, self.checkSpecDir, self.checkSpecInDir, self.checkTranDir, self.checkTranInDir]
-        for grp in grpList:
-            name = self.prefixEdit.text()+grp.text()
-            for aov in aovList:
-                if grp.isChecked() and aov.isChecked():
-                    if cmds.objExists('aiAOV_'+aov.text()+'_'+name)==False:
-                        aovs.AOVInterface().addAOV(aov.text()+'_'+name, aovType='rgb') 
-                else:
-                    if self.checkRemove.isChecked():
-                        if cmds.objExists('aiAOV_'+aov.text()+'_'+name)==True:
-                            aovs.AOVInterface().removeAOV(aov.text()+'_'+name)
+        aovLayout.apply_layout(self.current_layout())
 ##Launch UI
 if __name__ =="__main__":
     try:
@@ -0,0 +1,176 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Maya 2022.4
+####Script: maya_animCache
+####Version: 1.0
+####Note: Export a rig's animation to a .db3danim cache and import it onto any rig with matching controls.
+####      Select one rig and run the script, or call export_anim/import_anim from another tool.
+####File: b'DB3DANIM', uint32 version, uint32 header size, JSON header, then the raw curve arrays.
+####      The header maps every control name to its curves and their byte offsets, so an import only reads
+####      the curves of the controls it needs out of the memory mapped file.
+
+import array
+import json
+import mmap
+import struct
+import sys
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+
+import db3d_maya_animCurves as animCurves
+import db3d_maya_copyAnim as copyAnim
+
+MAGIC = b'DB3DANIM'
+VERSION = 1
+PREFIX = struct.Struct('<8sII')
+FIELD_TYPES = dict((field, getattr(animCurves.Curve_Data('', 0), field).typecode) for field in animCurves.ARRAY_FIELDS)
+
+##Writing
+def write_cache(path, controls, unit):
+    #controls maps a control name to a dict of attr:Curve_Data and an optional static pose
+    header = {'version':VERSION, 'unit':unit, 'byteorder':sys.byteorder, 'controls':{}}
+    blocks = []
+    offset = 0
+    for name, (curves, pose) in controls.items():
+        control = {'curves':[]}
+        for attr, curve in curves.items():
+            control['curves'].append({'attr':attr, 'curveType':curve.curveType,
+                                      'preInfinity':curve.preInfinity, 'postInfinity':curve.postInfinity,
+                                      'weighted':bool(curve.weighted), 'keys':len(curve), 'offset':offset})
+            for field in animCurves.ARRAY_FIELDS:
+                data = getattr(curve, field).tobytes()
+                blocks.append(data)
+                offset += len(data)
+        if pose is not None:
+            attrs, values = pose
+            control['pose'] = {'attrs':[list(attrKind) for attrKind in attrs], 'values':list(values)}
+        header['controls'][name] = control
+
+    headerData = json.dumps(header).encode('utf-8')
+    with open(path, 'wb') as cacheFile:
+        cacheFile.write(PREFIX.pack(MAGIC, VERSION, len(headerData)))
+        cacheFile.write(headerData)
+        for data in blocks:
+            cacheFile.write(data)
+
+##Reading
+class Anim_Cache(object):
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, headerSize = PREFIX.unpack_from(self.data, 0)
+        if magic != MAGIC or version > VERSION:
+            self.close()
+            raise ValueError('{} is not a db3d animation cache'.format(path))
+        self.header = json.loads(self.data[PREFIX.size:PREFIX.size+headerSize].decode('utf-8'))
+        self.dataStart = PREFIX.size+headerSize
+        self.swap = self.header['byteorder'] != sys.byteorder
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+            self.file.close()
+            self.data = None
+
+    @property
+    def unit(self):
+        return self.header['unit']
+
+    @property
+    def controls(self):
+        return self.header['controls']
+
+    def curve(self, entry):
+        curve = animCurves.Curve_Data(entry['attr'], entry['curveType'], entry['preInfinity'], entry['postInfinity'], entry['weighted'])
+        position = self.dataStart+entry['offset']
+        for field in animCurves.ARRAY_FIELDS:
+            values = array.array(FIELD_TYPES[field])
+            size = values.itemsize*entry['keys']
+            values.frombytes(self.data[position:position+size])
+            if self.swap:
+                values.byteswap()
+            setattr(curve, field, values)
+            position += size
+        return curve
+
+    def curves(self, name):
+        return dict((entry['attr'], self.curve(entry)) for entry in self.controls[name]['curves'])
+
+    def pose(self, name):
+        pose = self.controls[name].get('pose')
+        if pose is None:
+            return None
+        return [tuple(attrKind) for attrKind in pose['attrs']], array.array('d', pose['values'])
+
+##Maya
+def export_anim(rig, path):
+    controls = {}
+    for name, controlPath in copyAnim.control_index(rig).items():
+        controls[name] = animCurves.read_control(controlPath)
+    write_cache(path, controls, om.MTime.uiUnit())
+    return list(controls)
+
+def import_anim(rig, path, frameRange=None, offset=0.0):
+    #frameRange is in the cached clip's frames, offset moves the keys on the target
+    index = copyAnim.control_index(rig)
+    with Anim_Cache(path) as cache:
+        uiUnit = om.MTime.uiUnit()
+        scale = 1.0
+        if cache.unit != uiUnit:
+            scale = om.MTime(1.0, cache.unit).asUnits(uiUnit)
+        matched = [name for name in cache.controls if name in index]
+        writer = animCurves.Curve_Writer()
+        cmds.undoInfo(openChunk=True, chunkName='importAnim')
+        try:
+            for name in matched:
+                curves = cache.curves(name)
+                if curves:
+                    for attr, curve in curves.items():
+                        curve = animCurves.retime_curve(curve, frameRange=frameRange)
+                        if scale != 1.0 or offset:
+                            curve.times = array.array('d', [time*scale+offset for time in curve.times])
+                        curves[attr] = curve
+                    writer.write(index[name], curves)
+                elif cache.pose(name) is not None:
+                    writer.write_pose(index[name], cache.pose(name))
+            writer.commit()
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        cacheOnly = [name for name in cache.controls if name not in index]
+    rigOnly = [name for name in index if name not in cache.controls]
+    return matched, cacheOnly, rigOnly
+
+def main():
+    sel = cmds.ls(selection=True)
+    if len(sel) != 1:
+        cmds.warning('Select one rig to export or import animation.')
+        return
+    action = cmds.confirmDialog(title='Anim Cache', message='Export or import animation for '+sel[0]+'?',
+                                button=['Export', 'Import', 'Cancel'], cancelButton='Cancel', dismissString='Cancel')
+    if action == 'Cancel':
+        return
+    fileFilter = 'db3d Anim Cache (*.db3danim)'
+    paths = cmds.fileDialog2(fileFilter=fileFilter, fileMode=0 if action == 'Export' else 1, caption=action+' Animation')
+    if not paths:
+        return
+    if action == 'Export':
+        names = export_anim(sel[0], paths[0])
+        print('Exported {} controls to {}'.format(len(names), paths[0]))
+        return
+    matched, cacheOnly, rigOnly = import_anim(sel[0], paths[0])
+    print('Imported {} controls from {}'.format(len(matched), paths[0]))
+    for name in cacheOnly:
+        print('Warning : '+name+' has no match on '+sel[0])
+    for name in rigOnly:
+        print('Warning : '+name+' is not in the cache')
+
+if __name__ =="__main__":
+    main()
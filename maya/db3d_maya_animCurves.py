@@ -0,0 +1,275 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Maya 2022.4
+####Script: maya_animCurves
+####Version: 1.0
+####Note: Bulk anim curve transfer with OpenMaya 2.0, used by maya_copyAnim. Reads every key, tangent and weight
+####      of a control into arrays once and writes new curves without the clipboard.
+####      Controls without keys get their keyable pose copied through MPlugs in the same modifier.
+####      Writes are put on Maya's undo queue by the db3dAnimCurvesUndo command from maya_animCurvesUndo.
+
+import array
+import os
+
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+import maya.cmds as cmds
+
+PLUGIN_NAME = 'db3d_maya_animCurvesUndo'
+UNDO_COMMAND = 'db3dAnimCurvesUndo'
+FIXED_TANGENTS = (oma.MFnAnimCurve.kTangentFixed,)
+
+#Writes waiting for the undo command to pick them up. Only this module holds the queue, it is never loaded as a plugin
+_pending = []
+#Copyable keyable attributes per node type and keyable attribute set
+_pose_attrs = {}
+
+##Curve data
+class Curve_Data(object):
+    #Times are in the scene's ui time unit, values and tangents in Maya's internal units
+    __slots__ = ('attr', 'curveType', 'preInfinity', 'postInfinity', 'weighted',
+                 'times', 'values', 'inTypes', 'outTypes', 'inX', 'inY', 'outX', 'outY',
+                 'tangentsLocked', 'weightsLocked', 'breakdowns')
+
+    def __init__(self, attr, curveType, preInfinity=0, postInfinity=0, weighted=False):
+        self.attr = attr
+        self.curveType = curveType
+        self.preInfinity = preInfinity
+        self.postInfinity = postInfinity
+        self.weighted = weighted
+        self.times = array.array('d')
+        self.values = array.array('d')
+        self.inTypes = array.array('i')
+        self.outTypes = array.array('i')
+        self.inX = array.array('d')
+        self.inY = array.array('d')
+        self.outX = array.array('d')
+        self.outY = array.array('d')
+        self.tangentsLocked = array.array('b')
+        self.weightsLocked = array.array('b')
+        self.breakdowns = array.array('b')
+
+    def __len__(self):
+        return len(self.times)
+
+ARRAY_FIELDS = ('times', 'values', 'inTypes', 'outTypes', 'inX', 'inY', 'outX', 'outY', 'tangentsLocked', 'weightsLocked', 'breakdowns')
+
+def retime_curve(curve, offset=0.0, frameRange=None):
+    #Copy of the curve limited to frameRange (in source frames) and moved by offset frames
+    retimed = Curve_Data(curve.attr, curve.curveType, curve.preInfinity, curve.postInfinity, curve.weighted)
+    if frameRange is None:
+        keep = slice(None)
+    else:
+        keys = [i for i, time in enumerate(curve.times) if frameRange[0] <= time <= frameRange[1]]
+        keep = slice(keys[0], keys[-1]+1) if keys else slice(0, 0)
+    for field in ARRAY_FIELDS:
+        setattr(retimed, field, getattr(curve, field)[keep])
+    if offset:
+        retimed.times = array.array('d', [time+offset for time in retimed.times])
+    return retimed
+
+def node_object(node):
+    selection = om.MSelectionList()
+    selection.add(node)
+    return selection.getDependNode(0)
+
+def read_curve(attr, curveObj):
+    fn = oma.MFnAnimCurve(curveObj)
+    curve = Curve_Data(attr, fn.animCurveType, fn.preInfinityType, fn.postInfinityType, fn.isWeighted)
+    uiUnit = om.MTime.uiUnit()
+    for i in range(fn.numKeys):
+        curve.times.append(fn.input(i).asUnits(uiUnit))
+        curve.values.append(fn.value(i))
+        curve.inTypes.append(fn.inTangentType(i))
+        curve.outTypes.append(fn.outTangentType(i))
+        inX, inY = fn.getTangentXY(i, True)
+        outX, outY = fn.getTangentXY(i, False)
+        curve.inX.append(inX)
+        curve.inY.append(inY)
+        curve.outX.append(outX)
+        curve.outY.append(outY)
+        curve.tangentsLocked.append(fn.tangentsLocked(i))
+        curve.weightsLocked.append(fn.weightsLocked(i))
+        curve.breakdowns.append(fn.isBreakdown(i))
+    return curve
+
+def read_curves(node):
+    #One findAnimatedPlugs per control, only time based curves are copied like copyKey -animation objects
+    selection = om.MSelectionList()
+    selection.add(node)
+    curves = {}
+    for plug in oma.MAnimUtil.findAnimatedPlugs(selection):
+        for curveObj in oma.MAnimUtil.findAnimation(plug):
+            if oma.MFnAnimCurve(curveObj).isTimeInput:
+                attr = plug.partialName(useLongNames=True)
+                curves[attr] = read_curve(attr, curveObj)
+                break
+    return curves
+
+##Static pose
+def plug_kind(plug):
+    #Same attribute types the copyAnim getAttr fallback copied: double, doubleLinear, doubleAngle and enum
+    attrObj = plug.attribute()
+    if attrObj.hasFn(om.MFn.kEnumAttribute):
+        return 'enum'
+    if attrObj.hasFn(om.MFn.kUnitAttribute):
+        if om.MFnUnitAttribute(attrObj).unitType() in (om.MFnUnitAttribute.kDistance, om.MFnUnitAttribute.kAngle):
+            return 'double'
+        return None
+    if attrObj.hasFn(om.MFn.kNumericAttribute):
+        if om.MFnNumericAttribute(attrObj).numericType() == om.MFnNumericData.kDouble:
+            return 'double'
+    return None
+
+def attr_plugs(node, attrs):
+    selection = om.MSelectionList()
+    plugs = []
+    for attr in attrs:
+        try:
+            selection.add(node+'.'+attr)
+            plugs.append(selection.getPlug(selection.length()-1))
+        except (RuntimeError, TypeError):
+            plugs.append(None)
+    return plugs
+
+def pose_attrs(node):
+    keyable = tuple(cmds.listAttr(node, keyable=True) or [])
+    key = (om.MFnDependencyNode(node_object(node)).typeName, keyable)
+    if key not in _pose_attrs:
+        attrs = []
+        for attr, plug in zip(keyable, attr_plugs(node, keyable)):
+            kind = plug_kind(plug) if plug is not None else None
+            if kind:
+                attrs.append((attr, kind))
+        _pose_attrs[key] = attrs
+    return _pose_attrs[key]
+
+def read_pose(node):
+    attrs = pose_attrs(node)
+    values = array.array('d')
+    for (attr, kind), plug in zip(attrs, attr_plugs(node, [attr for attr, kind in attrs])):
+        values.append(plug.asInt() if kind == 'enum' else plug.asDouble())
+    return attrs, values
+
+def read_control(node):
+    #The control's curves, or its static pose when it has no animation
+    curves = read_curves(node)
+    return curves, None if curves else read_pose(node)
+
+##Writing
+def most_common(values):
+    counts = {}
+    for value in values:
+        counts[value] = counts.get(value, 0)+1
+    return max(counts, key=counts.get)
+
+class Curve_Writer(object):
+    #Collects every change in one MDGModifier and one MAnimCurveChange so the whole transfer is one undo
+    def __init__(self):
+        self.dgMod = om.MDGModifier()
+        self.animChange = oma.MAnimCurveChange()
+        self.skipped = []
+
+    def target_plug(self, nodeFn, attr):
+        try:
+            plug = nodeFn.findPlug(attr, False)
+        except RuntimeError:
+            return None
+        if plug.isLocked:
+            return None
+        source = plug.source()
+        #Leave plugs driven by anything other than a time based anim curve alone
+        if not source.isNull:
+            sourceNode = source.node()
+            if not sourceNode.hasFn(om.MFn.kAnimCurve) or not oma.MFnAnimCurve(sourceNode).isTimeInput:
+                return None
+        return plug
+
+    def write(self, node, curves):
+        nodeFn = om.MFnDependencyNode(node_object(node))
+        written = 0
+        for attr, curve in curves.items():
+            if not len(curve):
+                continue
+            plug = self.target_plug(nodeFn, attr)
+            if plug is None:
+                self.skipped.append(nodeFn.name()+'.'+attr)
+                continue
+            source = plug.source()
+            if not source.isNull:
+                self.dgMod.deleteNode(source.node())
+            self.write_curve(plug, curve)
+            written += 1
+        return written
+
+    def write_curve(self, plug, curve):
+        fn = oma.MFnAnimCurve()
+        fn.create(plug, curve.curveType, self.dgMod)
+        change = self.animChange
+        uiUnit = om.MTime.uiUnit()
+
+        #Keys go in with one addKeys call using the most common tangent types, only the keys that differ are touched again
+        inType = most_common(curve.inTypes)
+        outType = most_common(curve.outTypes)
+        times = om.MTimeArray([om.MTime(time, uiUnit) for time in curve.times])
+        fn.addKeys(times, om.MDoubleArray(curve.values), inType, outType, False, change)
+
+        fn.setIsWeighted(bool(curve.weighted), change)
+        fn.setPreInfinityType(curve.preInfinity, change)
+        fn.setPostInfinityType(curve.postInfinity, change)
+        for i in range(len(curve)):
+            #Setting a tangent makes it fixed, so the types are put back afterwards
+            #getTangentXY returns internal units, so they are written back without conversion
+            explicit = curve.weighted or curve.inTypes[i] in FIXED_TANGENTS or curve.outTypes[i] in FIXED_TANGENTS
+            if explicit:
+                fn.setTangentsLocked(i, False, change)
+                fn.setWeightsLocked(i, False, change)
+                fn.setTangent(i, curve.inX[i], curve.inY[i], True, change, convertUnits=False)
+                fn.setTangent(i, curve.outX[i], curve.outY[i], False, change, convertUnits=False)
+            if explicit or curve.inTypes[i] != inType:
+                fn.setInTangentType(i, curve.inTypes[i], change)
+            if explicit or curve.outTypes[i] != outType:
+                fn.setOutTangentType(i, curve.outTypes[i], change)
+            if explicit or not curve.tangentsLocked[i]:
+                fn.setTangentsLocked(i, bool(curve.tangentsLocked[i]), change)
+            if curve.weighted:
+                fn.setWeightsLocked(i, bool(curve.weightsLocked[i]), change)
+            if curve.breakdowns[i]:
+                fn.setIsBreakdown(i, True, change)
+
+    def write_pose(self, node, pose):
+        attrs, values = pose
+        written = 0
+        for (attr, kind), value, plug in zip(attrs, values, attr_plugs(node, [attr for attr, kind in attrs])):
+            #Same as getAttr -settable, locked or connected plugs are left alone
+            if plug is None or plug.isLocked or plug.isDestination:
+                continue
+            if kind == 'enum':
+                self.dgMod.newPlugValueInt(plug, int(value))
+            else:
+                self.dgMod.newPlugValueDouble(plug, value)
+            written += 1
+        return written
+
+    def write_control(self, node, control, offset=0.0):
+        curves, pose = control
+        if curves:
+            if offset:
+                curves = dict((attr, retime_curve(curve, offset)) for attr, curve in curves.items())
+            return self.write(node, curves)
+        if pose is not None:
+            return self.write_pose(node, pose)
+        return 0
+
+    def commit(self):
+        self.dgMod.doIt()
+        #Hand the changes to the undo command so ctrl+z reverts them with the rest of the chunk
+        load_plugin()
+        _pending.append((self.dgMod, self.animChange))
+        getattr(cmds, UNDO_COMMAND)()
+
+##Undo command
+def load_plugin():
+    if not cmds.pluginInfo(PLUGIN_NAME, query=True, loaded=True):
+        cmds.loadPlugin(os.path.join(os.path.dirname(os.path.abspath(__file__)), PLUGIN_NAME+'.py'), quiet=True)
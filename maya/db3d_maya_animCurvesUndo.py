@@ -0,0 +1,48 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Maya 2022.4
+####Script: maya_animCurvesUndo
+####Version: 1.0
+####Note: Plugin with the db3dAnimCurvesUndo command that puts maya_animCurves writes on Maya's undo queue.
+####      Loaded by maya_animCurves.load_plugin. Kept out of maya_animCurves so loading the plugin never makes a
+####      second copy of that module and its queue of pending writes.
+
+import maya.api.OpenMaya as om
+
+import db3d_maya_animCurves as animCurves
+
+def maya_useNewAPI():
+    pass
+
+class Anim_Curves_Undo(om.MPxCommand):
+    def __init__(self):
+        super(Anim_Curves_Undo, self).__init__()
+        self.dgMod = None
+        self.animChange = None
+
+    def doIt(self, args):
+        #Picks up the writes Curve_Writer.commit just made
+        if animCurves._pending:
+            self.dgMod, self.animChange = animCurves._pending.pop(0)
+
+    def redoIt(self):
+        self.dgMod.doIt()
+        self.animChange.redoIt()
+
+    def undoIt(self):
+        self.animChange.undoIt()
+        self.dgMod.undoIt()
+
+    def isUndoable(self):
+        return self.dgMod is not None
+
+    @staticmethod
+    def creator():
+        return Anim_Curves_Undo()
+
+def initializePlugin(plugin):
+    om.MFnPlugin(plugin, 'Dan C Bruce', '1.0').registerCommand(animCurves.UNDO_COMMAND, Anim_Curves_Undo.creator)
+
+def uninitializePlugin(plugin):
+    om.MFnPlugin(plugin).deregisterCommand(animCurves.UNDO_COMMAND)
@@ -0,0 +1,143 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Maya 2022.4
+####Script: maya_animVerify
+####Version: 1.0
+####Note: Checks that a paste rig's animation matches the copy rig after maya_copyAnim. Select the copy rig then
+####      the paste rig and run the script. Keys, values and tangents of every matched control are compared at once
+####      with NumPy, and the per control max error and missing keys are printed and can be saved as JSON.
+
+import collections
+import json
+
+import maya.cmds as cmds
+
+import db3d_maya_animCurves as animCurves
+import db3d_maya_copyAnim as copyAnim
+
+#Key times are matched to a thousandth of a frame
+TIME_PRECISION = 1000.0
+
+def import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError('Verifying animation needs NumPy, install it for mayapy (mayapy -m pip install numpy).')
+    return numpy
+
+def key_ids(np, times):
+    return np.round(times*TIME_PRECISION).astype(np.int64)
+
+def segment_max(np, values, counts):
+    #Max of each consecutive segment of values, 0 for empty segments
+    result = np.zeros(len(counts))
+    counts = np.asarray(counts, dtype=np.int64)
+    filled = counts > 0
+    if filled.any():
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        result[filled] = np.maximum.reduceat(values, starts)
+    return result
+
+def verify_rigs(copyRig, pasteRig, offset=None, frameRange=None, tolerance=1e-4):
+    np = import_numpy()
+    if offset is None:
+        offset = copyAnim.time_offset(pasteRig)
+    copyIndex = copyAnim.control_index(copyRig)
+    pasteIndex = copyAnim.control_index(pasteRig)
+    matched = [key for key in copyIndex if key in pasteIndex]
+
+    controls = collections.OrderedDict()
+    #One entry per compared curve or pose, the errors are reduced per entry in one pass at the end
+    owners = []
+    valueErrors = []
+    tangentErrors = []
+    for key in matched:
+        copyCurves, copyPose = animCurves.read_control(copyIndex[key])
+        control = {'maxError':0.0, 'maxTangentError':0.0, 'missingCurves':[], 'missingKeys':{}, 'extraKeys':{}}
+        controls[key] = control
+        if copyPose is not None:
+            attrs, values = animCurves.read_pose(pasteIndex[key])
+            pasteValues = dict(zip(attrs, values))
+            copyValues = np.frombuffer(copyPose[1], dtype=np.float64)
+            pasteArray = np.array([pasteValues.get(attrKind, np.nan) for attrKind in copyPose[0]], dtype=np.float64)
+            owners.append(key)
+            valueErrors.append(np.nan_to_num(np.abs(copyValues-pasteArray), nan=np.inf))
+            tangentErrors.append(np.zeros(0))
+            continue
+
+        pasteCurves = animCurves.read_curves(pasteIndex[key])
+        for attr, copyCurve in copyCurves.items():
+            pasteCurve = pasteCurves.get(attr)
+            if pasteCurve is None:
+                control['missingCurves'].append(attr)
+                continue
+            if frameRange is not None:
+                copyCurve = animCurves.retime_curve(copyCurve, frameRange=frameRange)
+                pasteCurve = animCurves.retime_curve(pasteCurve, frameRange=(frameRange[0]+offset, frameRange[1]+offset))
+            copyTimes = np.frombuffer(copyCurve.times, dtype=np.float64)+offset
+            pasteTimes = np.frombuffer(pasteCurve.times, dtype=np.float64)
+            copyIds = key_ids(np, copyTimes)
+            pasteIds = key_ids(np, pasteTimes)
+            common, copyKeys, pasteKeys = np.intersect1d(copyIds, pasteIds, assume_unique=True, return_indices=True)
+
+            missing = copyTimes[~np.isin(copyIds, common)]
+            extra = pasteTimes[~np.isin(pasteIds, common)]
+            if len(missing):
+                control['missingKeys'][attr] = missing.tolist()
+            if len(extra):
+                control['extraKeys'][attr] = extra.tolist()
+
+            def diff(field):
+                copyField = np.frombuffer(getattr(copyCurve, field), dtype=np.float64)[copyKeys]
+                pasteField = np.frombuffer(getattr(pasteCurve, field), dtype=np.float64)[pasteKeys]
+                return np.abs(copyField-pasteField)
+            owners.append(key)
+            valueErrors.append(diff('values'))
+            tangentErrors.append(np.maximum(np.maximum(diff('inX'), diff('inY')), np.maximum(diff('outX'), diff('outY'))))
+
+    if owners:
+        valueMax = segment_max(np, np.concatenate(valueErrors), [len(errors) for errors in valueErrors])
+        tangentMax = segment_max(np, np.concatenate(tangentErrors), [len(errors) for errors in tangentErrors])
+        for key, valueError, tangentError in zip(owners, valueMax.tolist(), tangentMax.tolist()):
+            controls[key]['maxError'] = max(controls[key]['maxError'], valueError)
+            controls[key]['maxTangentError'] = max(controls[key]['maxTangentError'], tangentError)
+
+    failed = [key for key, control in controls.items()
+              if control['maxError'] > tolerance or control['maxTangentError'] > tolerance
+              or control['missingCurves'] or control['missingKeys'] or control['extraKeys']]
+    return {'copyRig':copyRig, 'pasteRig':pasteRig, 'offset':offset, 'frameRange':frameRange, 'tolerance':tolerance,
+            'controls':controls, 'failed':failed,
+            'copyOnly':[key for key in copyIndex if key not in pasteIndex],
+            'pasteOnly':[key for key in pasteIndex if key not in copyIndex]}
+
+def print_table(report):
+    width = max([len(key) for key in report['controls']]+[7])
+    print('{} -> {}'.format(report['copyRig'], report['pasteRig']))
+    print('    {:<{w}}  {:>12}  {:>12}  {:>7}  {:>7}  {}'.format('Control', 'Max Error', 'Tangent', 'Missing', 'Extra', 'Status', w=width))
+    failed = set(report['failed'])
+    for key, control in report['controls'].items():
+        missing = sum(len(times) for times in control['missingKeys'].values())+len(control['missingCurves'])
+        extra = sum(len(times) for times in control['extraKeys'].values())
+        print('    {:<{w}}  {:>12.6g}  {:>12.6g}  {:>7}  {:>7}  {}'.format(key, control['maxError'], control['maxTangentError'],
+                                                                       missing, extra, 'FAIL' if key in failed else 'ok', w=width))
+    for key in report['copyOnly']:
+        print('    Warning : '+key+' has no match on '+report['pasteRig'])
+    print('{} of {} controls differ.'.format(len(report['failed']), len(report['controls'])))
+
+def write_report(report, path):
+    with open(path, 'w') as reportFile:
+        json.dump(report, reportFile, indent=4)
+
+def main():
+    sel = cmds.ls(selection=True)
+    if len(sel) != 2:
+        cmds.warning('Select the copy rig and the paste rig to verify.')
+        return
+    report = verify_rigs(sel[0], sel[1])
+    print_table(report)
+    if report['failed']:
+        cmds.warning('{} controls differ from {}. See the script editor.'.format(len(report['failed']), sel[0]))
+
+if __name__ =="__main__":
+    main()
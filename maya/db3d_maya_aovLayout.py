@@ -0,0 +1,117 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Maya 2022.4
+####Script: maya_aovLayout
+####Version: 1.0
+####Note: Light group/AOV layouts used by maya_addAOVLightGrps. No Qt so it also runs in mayapy.
+####      cmds and mtoa are imported in the functions that use them, so layouts can be read before Maya is initialized.
+
+import json
+import os
+
+AOV_TYPES = ['coat_direct', 'coat_indirect', 'diffuse_direct', 'diffuse_indirect', 'specular_direct', 'specular_indirect', 'transmission_direct', 'transmission_indirect']
+LIGHT_GROUPS = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J']
+
+##Layouts
+def default_layout():
+    #matrix maps each light group to the AOV types enabled for it
+    return {'prefix': 'Lgt',
+            'aovs': list(AOV_TYPES),
+            'groups': list(LIGHT_GROUPS),
+            'matrix': {'A': list(AOV_TYPES)},
+            'remove_unchecked': True}
+
+def load_layout(path):
+    layout = default_layout()
+    with open(path) as layoutFile:
+        layout.update(json.load(layoutFile))
+    return layout
+
+def save_layout(layout, path):
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    with open(path, 'w') as layoutFile:
+        json.dump(layout, layoutFile, indent=4)
+
+def preset_dir():
+    presetDir = os.environ.get('DB3D_AOV_PRESETS')
+    if presetDir:
+        return presetDir
+    return os.path.join(os.path.expanduser('~'), 'maya', 'db3d', 'aov_presets')
+
+def preset_path(show):
+    return os.path.join(preset_dir(), show+'.json')
+
+def list_presets():
+    presetDir = preset_dir()
+    if not os.path.isdir(presetDir):
+        return []
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(presetDir) if name.endswith('.json'))
+
+def current_show():
+    return os.environ.get('SHOW', 'default')
+
+##AOVs
+def aov_name(layout, group, aov):
+    return aov+'_'+layout['prefix']+group
+
+def layout_aov_names(layout):
+    #Every AOV the layout manages and the ones that should exist
+    managed = set()
+    wanted = set()
+    matrix = layout['matrix']
+    for group in layout['groups']:
+        enabled = set(matrix.get(group, []))
+        for aov in layout['aovs']:
+            name = aov_name(layout, group, aov)
+            managed.add(name)
+            if aov in enabled:
+                wanted.add(name)
+    return managed, wanted
+
+def diff_layout(layout, existing):
+    managed, wanted = layout_aov_names(layout)
+    addList = sorted(wanted - existing)
+    removeList = sorted((managed - wanted) & existing) if layout.get('remove_unchecked', True) else []
+    return addList, removeList
+
+def scene_aovs():
+    import maya.cmds as cmds
+    return set(node[len('aiAOV_'):] for node in cmds.ls('aiAOV_*', type='aiAOV') or [])
+
+def apply_layout(layout, dryRun=False):
+    import maya.cmds as cmds
+    import mtoa.aovs as aovs
+    addList, removeList = diff_layout(layout, scene_aovs())
+    if dryRun or (not addList and not removeList):
+        return addList, removeList
+
+    aovInterface = aovs.AOVInterface()
+    cmds.undoInfo(openChunk=True, chunkName='aovLayout')
+    try:
+        for name in addList:
+            aovInterface.addAOV(name, aovType='rgb')
+        if removeList:
+            aovInterface.removeAOVs(removeList)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return addList, removeList
+
+##Lights
+def assign_light_group(lights, layout, group):
+    #Sets the Arnold light group (aiAov) on every light shape under the given lights
+    import maya.cmds as cmds
+    name = layout['prefix']+group
+    shapes = cmds.ls(lights, dag=True, shapes=True, long=True) or []
+    assigned = []
+    cmds.undoInfo(openChunk=True, chunkName='aovLightGroup')
+    try:
+        for shape in shapes:
+            if cmds.attributeQuery('aiAov', node=shape, exists=True):
+                cmds.setAttr(shape+'.aiAov', name, type='string')
+                assigned.append(shape)
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return assigned
@@ -0,0 +1,125 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Maya 2022.4
+####Script: maya_batchAOVs
+####Version: 1.0
+####Note: Headless Add AOV Light Groups. Applies an AOV/light group layout to many .ma/.mb files.
+####Usage: mayapy db3d_maya_batchAOVs.py --show myShow shot_a.ma shot_b.mb
+####       mayapy db3d_maya_batchAOVs.py --layout layout.json --dry-run --workers 4 lighting/*.ma
+
+import argparse
+import concurrent.futures
+import json
+import sys
+
+_initialized = False
+
+#Maya
+def init_maya():
+    #Started once per worker process, cmds and mtoa are only imported after this
+    global _initialized
+    if _initialized:
+        return
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+    import maya.cmds as cmds
+    if not cmds.pluginInfo('mtoa', query=True, loaded=True):
+        cmds.loadPlugin('mtoa', quiet=True)
+    _initialized = True
+
+def read_layout(layout_path=None, show=None):
+    import db3d_maya_aovLayout as aovLayout
+    if layout_path:
+        return aovLayout.load_layout(layout_path)
+    return aovLayout.load_layout(aovLayout.preset_path(show or aovLayout.current_show()))
+
+
+#Profiling
+def start_profiler():
+    #DB3D_PROFILE=1 counts the cmds/mtoa calls of every scene, see db3d_common_hostProfiler.start_from_env
+    try:
+        import db3d_common_hostProfiler as hostProfiler
+    except ImportError:
+        return None
+    return hostProfiler if hostProfiler.start_from_env() else None
+
+
+#Files
+def process_scene(scene_path, layout, dry_run=False):
+    report = {'scene':scene_path, 'added':[], 'removed':[], 'saved':False, 'error':None}
+    hostProfiler = None
+    try:
+        init_maya()
+        hostProfiler = start_profiler()
+        import maya.cmds as cmds
+        import db3d_maya_aovLayout as aovLayout
+
+        cmds.file(scene_path, open=True, force=True, prompt=False)
+        addList, removeList = aovLayout.apply_layout(layout, dryRun=dry_run)
+        report['added'] = addList
+        report['removed'] = removeList
+        if (addList or removeList) and not dry_run:
+            cmds.file(save=True, force=True)
+            report['saved'] = True
+    except Exception as error:
+        report['error'] = '{}: {}'.format(type(error).__name__, error)
+    if hostProfiler:
+        report['profile'] = hostProfiler.snapshot(clear=True)
+    return report
+
+def process_scenes(scene_paths, layout, dry_run=False, workers=1):
+    if workers <= 1 or len(scene_paths) <= 1:
+        return [process_scene(scene_path, layout, dry_run) for scene_path in scene_paths]
+    #One scene at a time per mayapy worker, each worker initializes Maya once
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=init_maya) as executor:
+        futures = [executor.submit(process_scene, scene_path, layout, dry_run) for scene_path in scene_paths]
+        return [future.result() for future in futures]
+
+
+#Report
+def print_report(reports, dry_run=False):
+    for report in reports:
+        print(report['scene'])
+        if report['error']:
+            print('    Error : '+report['error'])
+            continue
+        for name in report['added']:
+            print('    + '+name)
+        for name in report['removed']:
+            print('    - '+name)
+        if not report['added'] and not report['removed']:
+            print('    Already matches the layout.')
+        elif dry_run:
+            print('    Dry run, nothing saved.')
+        elif report['saved']:
+            print('    Saved.')
+        if report.get('profile'):
+            import db3d_common_hostProfiler as hostProfiler
+            print(hostProfiler.format_report(report['profile']))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply an AOV light group layout to Maya scenes.')
+    parser.add_argument('scenes', nargs='+', help='.ma/.mb files to update')
+    parser.add_argument('--layout', help='JSON layout file')
+    parser.add_argument('--show', help='show preset to use when no --layout is given, defaults to $SHOW')
+    parser.add_argument('--dry-run', action='store_true', help='report the changes without saving')
+    parser.add_argument('--workers', type=int, default=1, help='number of mayapy worker processes')
+    parser.add_argument('--report', help='write the report as JSON to this path')
+    args = parser.parse_args(argv)
+
+    try:
+        layout = read_layout(args.layout, args.show)
+    except (IOError, ValueError) as error:
+        #Missing preset or broken JSON, nothing to apply
+        print('Error : could not read the AOV layout, {}'.format(error))
+        return 1
+    reports = process_scenes(args.scenes, layout, args.dry_run, args.workers)
+    print_report(reports, args.dry_run)
+    if args.report:
+        with open(args.report, 'w') as report_file:
+            json.dump(reports, report_file, indent=4)
+    return 1 if any(report['error'] for report in reports) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
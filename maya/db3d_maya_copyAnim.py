@@ -5,41 +5,133 @@
 ####Script: maya_copyAnim
 ####Version: 1.0
 ####Note: Copy animation from one rig to another.  First select the copy rig then the paste rig and run the script.
+####      Select more paste rigs to copy to all of them. Every paste rig is offset by its db3dTimeOffset attribute if it has one.
+####      Keys are copied with OpenMaya through db3d_maya_animCurves instead of the clipboard.
+####      Controls are matched by name with the namespace removed, so the rigs can differ in order or extra controls.
+
+import collections
 
 import maya.cmds as cmds
 
-sel =  cmds.ls(selection=True)
-
-if len(sel) == 2:
-    anim_copy_name = cmds.listRelatives(sel[0], allDescendents=True, type='nurbsCurve')    
-    anim_copy_path = cmds.listRelatives(sel[0], allDescendents=True, type='nurbsCurve', fullPath=True)
-    anim_paste_name = cmds.listRelatives(sel[1], allDescendents=True,  type='nurbsCurve')    
-    anim_paste_path = cmds.listRelatives(sel[1], allDescendents=True,  type='nurbsCurve', fullPath=True)
-    if len(anim_copy_name) == len(anim_paste_name):
-        for i in range(len(anim_paste_name)):
-            trans_copy_name = cmds.listRelatives(anim_copy_path[i], parent=True)                                
-            trans_copy_path = cmds.listRelatives(anim_copy_path[i], parent=True, fullPath=True)
-            trans_paste_name = cmds.listRelatives(anim_paste_path[i], parent=True)
-            trans_paste_path = cmds.listRelatives(anim_paste_path[i], parent=True, fullPath=True)
-            if anim_copy_name[i].split(":")[-1] == anim_paste_name[i].split(":")[-1]:                      
-                try:
-                    cmds.copyKey(trans_copy_path, animation='objects', option='keys')
-                    cmds.pasteKey(trans_paste_path, animation='objects', option='replaceCompletely')
-                    print('Copied Animation : from '+trans_copy_name[0]+" to "+trans_paste_name[0])
-                except:
-                    attr_list =  cmds.listAttr(trans_copy_path[0], keyable=True)
-                    if attr_list == None:
-                        continue     
-                    for attr in  attr_list:
-                        copy_type = cmds.getAttr(trans_copy_path[0]+'.'+attr, type=True)
-                        if copy_type not in ['doubleLinear', 'doubleAngle', 'double', 'enum']:
-                            continue                      
-                        if cmds.getAttr(trans_paste_path[0]+'.'+attr, settable=True):
-                            cmds.setAttr(trans_paste_path[0]+'.'+attr, cmds.getAttr(trans_copy_path[0]+'.'+attr))
-                    print('No Animation : '+trans_copy_name[0])
+import db3d_maya_animCurves as animCurves
+
+OFFSET_ATTR = 'db3dTimeOffset'
+
+def strip_namespace(path):
+    return '|'.join(name.split(':')[-1] for name in path.split('|'))
+
+def control_index(root):
+    #Every transform with a nurbsCurve shape under root, keyed by name without namespace.
+    #Names that are not unique in the rig are keyed by their path under root instead.
+    shapes = cmds.listRelatives(root, allDescendents=True, type='nurbsCurve', fullPath=True) or []
+    if not shapes:
+        return collections.OrderedDict()
+    transforms = cmds.listRelatives(shapes, parent=True, fullPath=True) or []
+    rootPath = cmds.ls(root, long=True)[0]
+
+    byName = collections.OrderedDict()
+    for path in transforms:
+        byName.setdefault(strip_namespace(path.split('|')[-1]), []).append(path)
+
+    index = collections.OrderedDict()
+    for name, paths in byName.items():
+        if len(paths) == 1:
+            index[name] = paths[0]
+            continue
+        for path in paths:
+            index[strip_namespace(path[len(rootPath):].lstrip('|'))] = path
+    return index
+
+def rig_type(root):
+    #Rigs loaded from the same file share a control layout
+    if cmds.referenceQuery(root, isNodeReferenced=True):
+        return cmds.referenceQuery(root, filename=True, withoutCopyNumber=True)
+    return strip_namespace(root.split('|')[-1])
+
+def cached_index(root, layouts):
+    #Reuses the control layout of the first rig of each type, checked with one ls instead of two listRelatives.
+    #layouts only lives for one copy so rigs or references edited in between are indexed again
+    rootPath = cmds.ls(root, long=True)[0]
+    namespace = rootPath.split('|')[-1].rpartition(':')[0]
+    prefix = namespace+':' if namespace else ''
+    rigType = rig_type(rootPath)
+    layout = layouts.get(rigType)
+    if layout is not None:
+        paths = [rootPath+''.join('|'+prefix+name for name in relative.split('|')) for relative in layout.values()]
+        if len(cmds.ls(paths) or []) == len(paths):
+            return collections.OrderedDict(zip(layout, paths))
+    index = control_index(rootPath)
+    layouts[rigType] = collections.OrderedDict((key, strip_namespace(path[len(rootPath):].lstrip('|'))) for key, path in index.items())
+    return index
+
+def time_offset(root):
+    #Frames the copy is moved by on this paste rig, also what maya_animVerify expects by default
+    if cmds.attributeQuery(OFFSET_ATTR, node=root, exists=True):
+        return cmds.getAttr(root+'.'+OFFSET_ATTR)
+    return 0.0
+
+def copy_anim_many(copyRig, pasteRigs, offsets=None):
+    #Reads the copy rig once and writes it to every paste rig, offsets maps a paste rig to a frame offset
+    #and defaults to the rig's db3dTimeOffset attribute
+    copyIndex = control_index(copyRig)
+    controls = collections.OrderedDict((key, animCurves.read_control(path)) for key, path in copyIndex.items())
+    writer = animCurves.Curve_Writer()
+    layouts = {}
+    reports = []
+    cmds.undoInfo(openChunk=True, chunkName='copyAnim')
+    try:
+        for pasteRig in pasteRigs:
+            pasteIndex = cached_index(pasteRig, layouts)
+            offset = offsets[pasteRig] if offsets and pasteRig in offsets else time_offset(pasteRig)
+            matched = [key for key in copyIndex if key in pasteIndex]
+            for key in matched:
+                writer.write_control(pasteIndex[key], controls[key], offset)
+            reports.append({'rig':pasteRig, 'offset':offset, 'matched':matched,
+                            'unanimated':[key for key in matched if not controls[key][0]],
+                            'copyOnly':[key for key in copyIndex if key not in pasteIndex],
+                            'pasteOnly':[key for key in pasteIndex if key not in copyIndex]})
+        writer.commit()
+    finally:
+        cmds.undoInfo(closeChunk=True)
+    return reports, writer.skipped
+
+def copy_anim(copyRig, pasteRig):
+    reports, skipped = copy_anim_many(copyRig, [pasteRig])
+    return reports[0], skipped
+
+def print_report(copyRig, reports, skipped):
+    for report in reports:
+        print('{} -> {}{}'.format(copyRig, report['rig'], ' (offset {:g})'.format(report['offset']) if report['offset'] else ''))
+        unanimated = set(report['unanimated'])
+        for key in report['matched']:
+            if key in unanimated:
+                print('    No Animation : '+key)
             else:
-                print('Warning : '+trans_copy_name[0]+" does not match "+ trans_paste_name[0])
+                print('    Copied Animation : '+key)
+        for key in report['copyOnly']:
+            print('    Warning : '+key+' has no match on '+report['rig'])
+        for key in report['pasteOnly']:
+            print('    Warning : '+key+' has no match on '+copyRig)
+    for plug in skipped:
+        print('Warning : '+plug+' is locked or connected and was not keyed')
+
+def main():
+    #Select the copy rig first, then one or more paste rigs
+    sel = cmds.ls(selection=True)
+    if len(sel) < 2:
+        cmds.warning('Select a rig to copy and a rig to paste.')
+        return
+    if len(sel) == 2:
+        reports, skipped = copy_anim(sel[0], sel[1])
+        reports = [reports]
     else:
+        reports, skipped = copy_anim_many(sel[0], sel[1:])
+    print_report(sel[0], reports, skipped)
+    unmatched = sum(len(report['copyOnly'])+len(report['pasteOnly']) for report in reports)
+    if not any(report['matched'] for report in reports):
         cmds.warning('Copy rig does not match paste rig.')
-else:
-    cmds.warning('Select a rig to copy and a rig to paste.')
\ No newline at end of file
+    elif unmatched:
+        cmds.warning('Copied to {} rigs, {} controls unmatched. See the script editor.'.format(len(reports), unmatched))
+
+if __name__ =="__main__":
+    main()
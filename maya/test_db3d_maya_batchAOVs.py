@@ -0,0 +1,174 @@
+####Author: Dan C Bruce
+####Email: dancbruce@gmail.com
+####Date: 10/18/2026
+####Software: Python 3
+####Script: maya_batchAOVs tests
+####Version: 1.0
+####Note: Runs the AOV layouts and the batch applier against stand-in maya.cmds and mtoa.aovs modules, no Maya needed.
+####Usage: python -m unittest discover maya
+
+import os
+import sys
+import types
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import db3d_maya_aovLayout as aovLayout
+import db3d_maya_batchAOVs as batchAOVs
+
+HOST_MODULES = ('maya', 'maya.cmds', 'maya.standalone', 'mtoa', 'mtoa.aovs')
+
+class Stand_In_Scene(object):
+    #What the stand-in cmds and AOVInterface read and change
+    def __init__(self):
+        self.aovs = set()
+        self.undo = []
+        self.calls = []
+        self.missing = set()
+
+def stand_in_modules(scene):
+    cmds = types.ModuleType('maya.cmds')
+
+    def ls(pattern, type=None):
+        return ['aiAOV_'+name for name in sorted(scene.aovs)]
+
+    def undoInfo(openChunk=False, closeChunk=False, chunkName=None):
+        scene.undo.append(('open', chunkName) if openChunk else ('close',))
+
+    def file(path=None, open=False, save=False, force=False, prompt=True):
+        if open and path in scene.missing:
+            raise RuntimeError('File not found: '+path)
+        scene.calls.append(('open', path) if open else ('save',))
+
+    cmds.ls = ls
+    cmds.undoInfo = undoInfo
+    cmds.file = file
+    cmds.pluginInfo = lambda name, query=False, loaded=False: True
+    cmds.loadPlugin = lambda name, quiet=False: None
+
+    standalone = types.ModuleType('maya.standalone')
+    standalone.initialize = lambda name='python': None
+    maya = types.ModuleType('maya')
+    maya.cmds = cmds
+    maya.standalone = standalone
+
+    class AOVInterface(object):
+        def addAOV(self, name, aovType='rgb'):
+            scene.aovs.add(name)
+
+        def removeAOVs(self, names):
+            scene.aovs.difference_update(names)
+
+    aovs = types.ModuleType('mtoa.aovs')
+    aovs.AOVInterface = AOVInterface
+    mtoa = types.ModuleType('mtoa')
+    mtoa.aovs = aovs
+    return {'maya':maya, 'maya.cmds':cmds, 'maya.standalone':standalone, 'mtoa':mtoa, 'mtoa.aovs':aovs}
+
+def small_layout(removeUnchecked=True):
+    return {'prefix':'Lgt',
+            'aovs':['diffuse_direct', 'specular_direct'],
+            'groups':['A', 'B'],
+            'matrix':{'A':['diffuse_direct', 'specular_direct'], 'B':['diffuse_direct']},
+            'remove_unchecked':removeUnchecked}
+
+class Host_Test(unittest.TestCase):
+    def setUp(self):
+        self.saved = dict((name, sys.modules.get(name)) for name in HOST_MODULES)
+        self.scene = Stand_In_Scene()
+        sys.modules.update(stand_in_modules(self.scene))
+        self.environ = os.environ.pop('DB3D_PROFILE', None)
+
+    def tearDown(self):
+        for name, module in self.saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        batchAOVs._initialized = False
+        if self.environ is not None:
+            os.environ['DB3D_PROFILE'] = self.environ
+
+class Diff_Layout_Test(unittest.TestCase):
+    def test_adds_and_removes(self):
+        existing = {'diffuse_direct_LgtA', 'specular_direct_LgtB', 'beauty_extra'}
+        addList, removeList = aovLayout.diff_layout(small_layout(), existing)
+        self.assertEqual(addList, ['diffuse_direct_LgtB', 'specular_direct_LgtA'])
+        #AOVs the layout doesn't manage are never removed
+        self.assertEqual(removeList, ['specular_direct_LgtB'])
+
+    def test_keeps_unchecked(self):
+        addList, removeList = aovLayout.diff_layout(small_layout(False), {'specular_direct_LgtB'})
+        self.assertEqual(removeList, [])
+        self.assertEqual(len(addList), 3)
+
+    def test_default_layout(self):
+        #Layouts are read and diffed before Maya is initialized
+        self.assertFalse(hasattr(aovLayout, 'cmds'))
+        layout = aovLayout.default_layout()
+        self.assertEqual(aovLayout.diff_layout(layout, set())[0], sorted(aov+'_LgtA' for aov in aovLayout.AOV_TYPES))
+
+class Apply_Layout_Test(Host_Test):
+    def test_dry_run(self):
+        self.scene.aovs.update(['specular_direct_LgtB'])
+        addList, removeList = aovLayout.apply_layout(small_layout(), dryRun=True)
+        self.assertEqual(addList, ['diffuse_direct_LgtA', 'diffuse_direct_LgtB', 'specular_direct_LgtA'])
+        self.assertEqual(removeList, ['specular_direct_LgtB'])
+        self.assertEqual(self.scene.aovs, {'specular_direct_LgtB'})
+        self.assertEqual(self.scene.undo, [])
+
+    def test_applies_in_one_undo_chunk(self):
+        self.scene.aovs.update(['specular_direct_LgtB', 'beauty_extra'])
+        aovLayout.apply_layout(small_layout())
+        self.assertEqual(self.scene.aovs, {'diffuse_direct_LgtA', 'diffuse_direct_LgtB', 'specular_direct_LgtA', 'beauty_extra'})
+        self.assertEqual(self.scene.undo, [('open', 'aovLayout'), ('close',)])
+
+    def test_remove_unchecked_off(self):
+        self.scene.aovs.update(['specular_direct_LgtB'])
+        addList, removeList = aovLayout.apply_layout(small_layout(False))
+        self.assertEqual(removeList, [])
+        self.assertIn('specular_direct_LgtB', self.scene.aovs)
+
+    def test_matching_scene_is_untouched(self):
+        self.scene.aovs.update(['diffuse_direct_LgtA', 'diffuse_direct_LgtB', 'specular_direct_LgtA'])
+        self.assertEqual(aovLayout.apply_layout(small_layout()), ([], []))
+        self.assertEqual(self.scene.undo, [])
+
+class Process_Scene_Test(Host_Test):
+    def test_saves_changed_scene(self):
+        report = batchAOVs.process_scene('shot.ma', small_layout())
+        self.assertIsNone(report['error'])
+        self.assertTrue(report['saved'])
+        self.assertEqual(report['added'], ['diffuse_direct_LgtA', 'diffuse_direct_LgtB', 'specular_direct_LgtA'])
+        self.assertEqual(self.scene.calls, [('open', 'shot.ma'), ('save',)])
+
+    def test_dry_run_does_not_save(self):
+        report = batchAOVs.process_scene('shot.ma', small_layout(), dry_run=True)
+        self.assertFalse(report['saved'])
+        self.assertEqual(len(report['added']), 3)
+        self.assertEqual(self.scene.calls, [('open', 'shot.ma')])
+
+    def test_open_error_is_reported(self):
+        self.scene.missing.add('missing.ma')
+        reports = batchAOVs.process_scenes(['missing.ma', 'shot.ma'], small_layout())
+        self.assertEqual(reports[0]['error'], 'RuntimeError: File not found: missing.ma')
+        self.assertFalse(reports[0]['saved'])
+        #One broken scene doesn't stop the rest
+        self.assertIsNone(reports[1]['error'])
+        self.assertTrue(reports[1]['saved'])
+
+    def test_missing_preset_is_an_error(self):
+        presets = os.environ.get('DB3D_AOV_PRESETS')
+        os.environ['DB3D_AOV_PRESETS'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'no_presets')
+        try:
+            self.assertEqual(batchAOVs.main(['--show', 'missing', 'shot.ma']), 1)
+        finally:
+            if presets is None:
+                del os.environ['DB3D_AOV_PRESETS']
+            else:
+                os.environ['DB3D_AOV_PRESETS'] = presets
+        self.assertEqual(self.scene.calls, [])
+
+if __name__ =="__main__":
+    unittest.main()